@@ -0,0 +1,208 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+
+# Downloaded assets and their HTTP validators are cached here
+DOWNLOAD_CACHE_DIR = os.environ.get(
+    'CRYPTOQUEST_DOWNLOAD_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'cryptoquest', 'downloads'))
+
+# Seconds a response without Cache-Control or Expires is used without revalidating
+DEFAULT_MAX_AGE = 7 * 24 * 60 * 60
+
+# Seconds to wait for a server to connect or send data
+DEFAULT_TIMEOUT = 10
+
+# Concurrent downloads, which is also the size of the keep-alive pool
+DEFAULT_WORKERS = 4
+
+# Browser User-Agent, as sent by the original image downloads; some hosts refuse others
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+
+
+def _freshness(headers, now):
+    """
+    Time until which a response may be used without asking the server, or
+    None if it must not be stored at all.
+    """
+    cache_control = headers.get('Cache-Control', '').lower()
+    directives = {}
+    for part in cache_control.split(','):
+        name, _, value = part.strip().partition('=')
+        directives[name] = value.strip('"')
+
+    if 'no-store' in directives:
+        return None
+    if 'no-cache' in directives:
+        return now
+    if 'max-age' in directives:
+        try:
+            return now + int(directives['max-age'])
+        except ValueError:
+            return now
+    if 'Expires' in headers:
+        try:
+            return parsedate_to_datetime(headers['Expires']).timestamp()
+        except (TypeError, ValueError):
+            return now
+    return now + DEFAULT_MAX_AGE
+
+
+class AssetFetcher:
+    """
+    Download remote assets over one keep-alive session with an HTTP cache.
+
+    Responses are stored on disk with their ETag and Last-Modified
+    validators. While an entry is fresh (Cache-Control max-age, Expires,
+    or DEFAULT_MAX_AGE when the server gives neither) it is served without
+    any network traffic, so later launches make no requests at all. Once
+    stale it is revalidated with If-None-Match/If-Modified-Since and a 304
+    reuses the stored body. fetch_many downloads with at most max_workers
+    requests in flight.
+    """
+
+    def __init__(self, cache_dir=None, max_workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT):
+        self.cache_dir = cache_dir or DOWNLOAD_CACHE_DIR
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def session(self):
+        """The shared requests.Session, created on first use"""
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.max_workers,
+                                      pool_maxsize=self.max_workers)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers['User-Agent'] = USER_AGENT
+                self._session = session
+            return self._session
+
+    def _cache_paths(self, url):
+        name = hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+        base = os.path.join(self.cache_dir, name)
+        return f"{base}.body", f"{base}.json"
+
+    def _read_entry(self, url):
+        """Cached metadata and body for url, or (None, None)"""
+        body_path, meta_path = self._cache_paths(url)
+        try:
+            with open(meta_path) as file:
+                meta = json.load(file)
+            if meta.get('url') != url:
+                return None, None
+            with open(body_path, 'rb') as file:
+                body = file.read()
+        except (OSError, ValueError):
+            return None, None
+        return meta, body
+
+    def _write_entry(self, url, meta, body=None):
+        """Store metadata, and the body when it changed, replacing files atomically"""
+        body_path, meta_path = self._cache_paths(url)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if body is not None:
+                with open(body_path + suffix, 'wb') as file:
+                    file.write(body)
+                os.replace(body_path + suffix, body_path)
+            with open(meta_path + suffix, 'w') as file:
+                json.dump(meta, file)
+            os.replace(meta_path + suffix, meta_path)
+        except OSError as e:
+            logging.warning(f"Could not cache download {url}: {str(e)}")
+
+    def fetch(self, url):
+        """Return the body of url, from the cache when possible"""
+        meta, body = self._read_entry(url)
+        now = time.time()
+        if meta is not None and now < meta.get('fresh_until', 0):
+            return body
+
+        headers = {}
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and meta is not None:
+            fresh_until = _freshness(response.headers, now)
+            if fresh_until is not None:
+                meta['fresh_until'] = fresh_until
+                meta['etag'] = response.headers.get('ETag', meta.get('etag'))
+                meta['last_modified'] = response.headers.get('Last-Modified', meta.get('last_modified'))
+                self._write_entry(url, meta)
+            return body
+
+        response.raise_for_status()
+        body = response.content
+        fresh_until = _freshness(response.headers, now)
+        if fresh_until is not None:
+            self._write_entry(url, {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'fresh_until': fresh_until,
+            }, body)
+        return body
+
+    def fetch_many(self, urls):
+        """
+        Fetch several URLs concurrently. Returns a dict of url -> body, with
+        None for URLs that failed (the error is logged).
+        """
+        urls = list(dict.fromkeys(urls))
+
+        def fetch_or_none(url):
+            try:
+                return self.fetch(url)
+            except Exception as e:
+                logging.error(f"Error downloading {url}: {str(e)}")
+                return None
+
+        if len(urls) < 2:
+            return {url: fetch_or_none(url) for url in urls}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as executor:
+            return dict(zip(urls, executor.map(fetch_or_none, urls)))
+
+    def close(self):
+        """Close the pooled connections"""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+_default_fetcher = None
+_default_fetcher_lock = threading.Lock()
+
+
+def get_fetcher():
+    """The fetcher shared by the game, created on first use"""
+    global _default_fetcher
+    with _default_fetcher_lock:
+        if _default_fetcher is None:
+            _default_fetcher = AssetFetcher()
+        return _default_fetcher
@@ -0,0 +1,177 @@
+import numpy as np
+
+from crypto_tools import CryptoTools
+
+# Every byte value once, used to derive lookup tables from the scalar ciphers
+_ALL_BYTES = bytes(range(256))
+
+# True for the bytes that str.isalpha() accepts in ASCII text
+_IS_ALPHA = np.zeros(256, dtype=bool)
+_IS_ALPHA[np.frombuffer(b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz', dtype=np.uint8)] = True
+
+
+def _offsets(lengths):
+    """Start offset of every text plus the end of the last one, as int64"""
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+def _pack(texts):
+    """
+    Concatenate the ASCII texts into one uint8 buffer. Non-ASCII texts are
+    left out so they can keep the scalar path and stay byte-identical.
+    Returns (indices, buffer, offsets); indices is None when every text
+    was packed.
+    """
+    joined = ''.join(texts)
+    if joined.isascii():
+        indices = None
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    else:
+        indices = [i for i, text in enumerate(texts) if text.isascii()]
+        joined = ''.join(texts[i] for i in indices)
+        lengths = np.fromiter((len(texts[i]) for i in indices), dtype=np.int64, count=len(indices))
+    buffer = np.frombuffer(joined.encode('ascii'), dtype=np.uint8)
+    return indices, buffer, _offsets(lengths)
+
+
+def _unpack(buffer, offsets):
+    """Slice the processed buffer back into one string per packed text"""
+    data = buffer.tobytes().decode('ascii')
+    bounds = offsets.tolist()
+    return list(map(data.__getitem__, map(slice, bounds[:-1], bounds[1:])))
+
+
+def _merge(texts, indices, packed, scalar):
+    """Combine packed results with the scalar path for the remaining texts"""
+    if indices is None:
+        return packed
+    results = [None] * len(texts)
+    for i, text in zip(indices, packed):
+        results[i] = text
+    for i, text in enumerate(texts):
+        if results[i] is None:
+            results[i] = scalar(text)
+    return results
+
+
+def _translate(buffer, table):
+    """Map every byte of a uint8 buffer through a 256-byte table"""
+    return np.frombuffer(np.asarray(buffer, dtype=np.uint8).tobytes().translate(table), dtype=np.uint8)
+
+
+class BatchCryptoTools:
+    """
+    Vectorized versions of the CryptoTools ciphers.
+
+    Each method takes a list (or array) of texts and returns a list of
+    results that match the CryptoTools methods character for character.
+    All ASCII texts are concatenated into a single uint8 buffer and
+    transformed in one pass; any non-ASCII text falls back to the scalar
+    implementation.
+
+    Building one str per result is most of the cost of a large batch, so
+    callers that can work with bytes should use the *_buffer methods:
+    pack the texts once, transform the (buffer, offsets) pair, and only
+    unpack the texts they need. offsets[i]:offsets[i + 1] is text i.
+    """
+
+    @staticmethod
+    def pack(texts):
+        """
+        Concatenate ASCII texts into a (uint8 buffer, int64 offsets) pair for
+        the *_buffer methods. Raises UnicodeEncodeError for non-ASCII text.
+        """
+        texts = list(texts)
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+        buffer = np.frombuffer(''.join(texts).encode('ascii'), dtype=np.uint8)
+        return buffer, _offsets(lengths)
+
+    @staticmethod
+    def unpack(buffer, offsets):
+        """Split a (buffer, offsets) pair back into a list of strings"""
+        return _unpack(buffer, offsets)
+
+    @staticmethod
+    def caesar_buffer(buffer, offsets, shift, decrypt=False):
+        """
+        Encrypt or decrypt packed texts using Caesar cipher
+        """
+        return _translate(buffer, CryptoTools.caesar_cipher(_ALL_BYTES, shift, decrypt)), offsets
+
+    @staticmethod
+    def atbash_buffer(buffer, offsets):
+        """
+        Encrypt or decrypt packed texts using Atbash cipher
+        """
+        return _translate(buffer, CryptoTools.atbash_cipher(_ALL_BYTES)), offsets
+
+    @staticmethod
+    def vigenere_buffer(buffer, offsets, key, decrypt=False):
+        """
+        Encrypt or decrypt packed texts using Vigenère cipher; the key
+        restarts at each text
+        """
+        if not key:
+            raise ValueError("Vigenère key must not be empty")
+        buffer = np.asarray(buffer, dtype=np.uint8)
+
+        key_as_int = np.array([ord(i) for i in key.lower()], dtype=np.intp)
+        if decrypt:
+            key_as_int = -key_as_int
+
+        # One 256-entry lookup row per key position, repeated so that rows
+        # L..2L-1 match rows 0..L-1 and the key position needs no modulo
+        byte_values = np.arange(256, dtype=np.intp)
+        table = (byte_values + key_as_int[:, None]) % 26 + ord('A')
+        table = np.where(_IS_ALPHA, table, byte_values).astype(np.uint8)
+        table = np.concatenate([table, table]).ravel()
+
+        # Key position of every byte, plus L: the position in the repeating key
+        # pattern minus the phase the text starts at. Only offsets are 64-bit;
+        # per-byte values stay below 2L, so a narrow dtype cannot wrap.
+        key_length = len(key_as_int)
+        dtype = np.uint16 if key_length <= 128 else np.uint32
+        offsets = np.asarray(offsets, dtype=np.int64)
+        phase = np.repeat((offsets[:-1] % key_length).astype(dtype), np.diff(offsets))
+        index = np.tile(np.arange(key_length, 2 * key_length, dtype=dtype),
+                        buffer.size // key_length + 1)[:buffer.size]
+        index -= phase
+        index <<= 8
+        index += buffer
+        return np.take(table, index), offsets
+
+    @staticmethod
+    def _apply(texts, transform, scalar):
+        texts = list(texts)
+        indices, buffer, offsets = _pack(texts)
+        output, offsets = transform(buffer, offsets)
+        return _merge(texts, indices, _unpack(output, offsets), scalar)
+
+    @staticmethod
+    def caesar_cipher(texts, shift, decrypt=False):
+        """
+        Encrypt or decrypt many texts using Caesar cipher
+        """
+        return BatchCryptoTools._apply(
+            texts, lambda buffer, offsets: BatchCryptoTools.caesar_buffer(buffer, offsets, shift, decrypt),
+            lambda text: CryptoTools.caesar_cipher(text, shift, decrypt))
+
+    @staticmethod
+    def atbash_cipher(texts):
+        """
+        Encrypt or decrypt many texts using Atbash cipher
+        """
+        return BatchCryptoTools._apply(texts, BatchCryptoTools.atbash_buffer, CryptoTools.atbash_cipher)
+
+    @staticmethod
+    def vigenere_cipher(texts, key, decrypt=False):
+        """
+        Encrypt or decrypt many texts using Vigenère cipher
+        """
+        if not key:
+            return [CryptoTools.vigenere_cipher(text, key, decrypt) for text in texts]
+        return BatchCryptoTools._apply(
+            texts, lambda buffer, offsets: BatchCryptoTools.vigenere_buffer(buffer, offsets, key, decrypt),
+            lambda text: CryptoTools.vigenere_cipher(text, key, decrypt))
@@ -0,0 +1,98 @@
+_WHITESPACE = b' \t\r\n'
+
+
+def _bit_string(data):
+    """ASCII bits of a bytes-like object, 8 per byte, as bytes"""
+    data = memoryview(data).cast('B')
+    if not data:
+        return b''
+    return format(int.from_bytes(data, 'big'), f'0{8 * len(data)}b').encode('ascii')
+
+
+def _clean_bits(bits):
+    """Strip whitespace from a bit string and check it holds whole bytes of 0s and 1s"""
+    if isinstance(bits, str):
+        bits = bits.encode('ascii')
+    bits = bytes(bits).translate(None, _WHITESPACE)
+    if bits.translate(None, b'01'):
+        raise ValueError("Binary input may only contain 0, 1 and whitespace")
+    if len(bits) % 8:
+        raise ValueError(f"Binary input has {len(bits)} bits, which is not a whole number of bytes")
+    return bits
+
+
+def bits_size(byte_count, sep=b' '):
+    """Length of the bit string for byte_count bytes, for preallocating buffers"""
+    if not byte_count:
+        return 0
+    return byte_count * 8 + (byte_count - 1) * len(sep)
+
+
+def bytes_to_bits_into(data, out, sep=b' '):
+    """
+    Write the bit string of data into the writable buffer out.
+
+    Each byte becomes eight ASCII '0'/'1' characters, with sep between
+    bytes. The whole conversion is one int.from_bytes/format call plus
+    strided slice copies, so no per-byte objects are created. Returns the
+    number of bytes written; out must hold at least bits_size(len(data), sep).
+    """
+    bits = _bit_string(data)
+    byte_count = len(bits) // 8
+    size = bits_size(byte_count, sep)
+    # Strided copies are much faster on a bytearray than through a memoryview
+    if not isinstance(out, bytearray):
+        out = memoryview(out).cast('B')
+    if len(out) < size:
+        raise ValueError(f"Output buffer holds {len(out)} bytes, {size} needed")
+    if not sep:
+        out[:size] = bits
+        return size
+
+    stride = 8 + len(sep)
+    for bit in range(8):
+        out[bit:size:stride] = bits[bit::8]
+    for offset, value in enumerate(sep):
+        out[8 + offset:size:stride] = bytes([value]) * (byte_count - 1)
+    return size
+
+
+def bytes_to_bits(data, sep=' '):
+    """Convert a bytes-like object to a bit string such as '01001000 01101001'"""
+    sep = sep.encode('ascii')
+    out = bytearray(bits_size(len(memoryview(data).cast('B')), sep))
+    bytes_to_bits_into(data, out, sep)
+    return out.decode('ascii')
+
+
+def bits_to_bytes_into(bits, out):
+    """
+    Write the bytes of a bit string into the writable buffer out.
+
+    Whitespace in bits is ignored. Returns the number of bytes written.
+    """
+    bits = _clean_bits(bits)
+    size = len(bits) // 8
+    out = memoryview(out).cast('B')
+    if len(out) < size:
+        raise ValueError(f"Output buffer holds {len(out)} bytes, {size} needed")
+    if size:
+        out[:size] = int(bits, 2).to_bytes(size, 'big')
+    return size
+
+
+def bits_to_bytes(bits):
+    """Convert a bit string such as '01001000 01101001' to bytes"""
+    bits = _clean_bits(bits)
+    size = len(bits) // 8
+    return int(bits, 2).to_bytes(size, 'big') if size else b''
+
+
+def text_to_bits(text, sep=' ', encoding='utf-8'):
+    """Convert text to a bit string of its encoded bytes"""
+    return bytes_to_bits(text.encode(encoding), sep)
+
+
+def bits_to_text(bits, encoding='utf-8', errors='strict'):
+    """Convert a bit string back to text"""
+    return bits_to_bytes(bits).decode(encoding, errors)
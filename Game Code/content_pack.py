@@ -0,0 +1,263 @@
+import bisect
+import json
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+
+# File layout: magic, format version, header length, JSON header, data.
+# The header holds the meta and, per section, [entry count, index offset,
+# order offset]. Per section the data holds the records, the keys, an
+# index of fixed-width entries sorted by key and an order table giving the
+# index position of each entry in the order the section was written.
+# Offsets are counted from the end of the header; every record is a UTF-8
+# JSON value.
+PACK_MAGIC = b'CQPK'
+PACK_VERSION = 2
+_PACK_PREAMBLE = struct.Struct('<4sHI')
+
+# Index entry: key offset, key length, record offset, record length
+_INDEX_ENTRY = struct.Struct('<QIQI')
+
+# Order table entry: position in the sorted index
+_ORDER_ENTRY = struct.Struct('<I')
+
+# Sections a pack may provide to GameData
+SECTIONS = ('rooms', 'puzzles', 'items', 'messages')
+
+# Parsed records each section keeps, least recently used dropped first
+RECORD_CACHE_SIZE = 256
+
+
+class _IndexKeys:
+    """The keys of a section index as a sequence of bytes, for bisect"""
+
+    def __init__(self, data, data_start, index_start, count):
+        self._data = data
+        self._data_start = data_start
+        self._index_start = index_start
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def entry(self, position):
+        return _INDEX_ENTRY.unpack_from(self._data, self._index_start + position * _INDEX_ENTRY.size)
+
+    def __getitem__(self, position):
+        key_offset, key_length, _, _ = self.entry(position)
+        start = self._data_start + key_offset
+        return self._data[start:start + key_length]
+
+
+class PackSection(Mapping):
+    """
+    Read-only mapping over one section of a content pack.
+
+    Lookups bisect the section's sorted index in the memory-mapped file and
+    iteration walks its order table, so opening the pack reads nothing per
+    entry. The last RECORD_CACHE_SIZE parsed records are kept; records are
+    never changed at runtime (GameEngine copies a room's items before
+    taking one), so an evicted record parses back the same.
+    """
+
+    def __init__(self, pack, name, count, index_offset, order_offset):
+        self._pack = pack
+        self.name = name
+        self._count = count
+        self._index_offset = index_offset
+        self._order_offset = order_offset
+        self._records = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key):
+        with self._lock:
+            if key in self._records:
+                self._records.move_to_end(key)
+                return self._records[key]
+        location = self._pack.find(self._index_offset, self._count, key)
+        if location is None:
+            raise KeyError(key)
+        record = self._pack.read_record(*location)
+        with self._lock:
+            self._records[key] = record
+            if len(self._records) > RECORD_CACHE_SIZE:
+                self._records.popitem(last=False)
+        return record
+
+    def __iter__(self):
+        return self._pack.section_keys(self._index_offset, self._order_offset, self._count)
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, key):
+        return self._pack.find(self._index_offset, self._count, key) is not None
+
+    def loaded(self):
+        """Number of parsed records currently cached"""
+        return len(self._records)
+
+
+class ContentPack:
+    """
+    An on-disk content pack opened for lazy reading.
+
+    Opening reads only the preamble and the small header, whatever the
+    number of entries; the index tables and records are memory-mapped and
+    read on demand by the PackSection mappings.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'rb')
+        try:
+            preamble = self._file.read(_PACK_PREAMBLE.size)
+            if len(preamble) != _PACK_PREAMBLE.size:
+                raise ValueError(f"{path} is not a content pack")
+            magic, version, header_length = _PACK_PREAMBLE.unpack(preamble)
+            if magic != PACK_MAGIC:
+                raise ValueError(f"{path} is not a content pack")
+            if version != PACK_VERSION:
+                raise ValueError(f"Unsupported content pack version {version}")
+            header = json.loads(self._file.read(header_length).decode('utf-8'))
+            self._data_start = _PACK_PREAMBLE.size + header_length
+            self._map = None
+            if os.fstat(self._file.fileno()).st_size > self._data_start:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+
+        self.meta = header.get('meta', {})
+        self.sections = {name: PackSection(self, name, *table)
+                         for name, table in header.get('sections', {}).items()}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __getitem__(self, name):
+        return self.sections[name]
+
+    def __contains__(self, name):
+        return name in self.sections
+
+    def _mapped(self):
+        if self._map is None:
+            raise ValueError("Content pack is closed or empty")
+        return self._map
+
+    def find(self, index_offset, count, key):
+        """(record offset, record length) of key in a section index, or None"""
+        if not isinstance(key, str) or not count:
+            return None
+        target = key.encode('utf-8')
+        with self._lock:
+            keys = _IndexKeys(self._mapped(), self._data_start, self._data_start + index_offset, count)
+            position = bisect.bisect_left(keys, target)
+            if position == count or keys[position] != target:
+                return None
+            _, _, record_offset, record_length = keys.entry(position)
+        return record_offset, record_length
+
+    def section_keys(self, index_offset, order_offset, count):
+        """Yield a section's keys in the order they were written"""
+        order_start = self._data_start + order_offset
+        for i in range(count):
+            with self._lock:
+                data = self._mapped()
+                (position,) = _ORDER_ENTRY.unpack_from(data, order_start + i * _ORDER_ENTRY.size)
+                key = _IndexKeys(data, self._data_start, self._data_start + index_offset, count)[position]
+            yield key.decode('utf-8')
+
+    def read_record(self, offset, length):
+        """Parse the record stored at offset"""
+        start = self._data_start + offset
+        with self._lock:
+            data = self._mapped()[start:start + length]
+        return json.loads(data.decode('utf-8'))
+
+    def close(self):
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._file.close()
+
+
+def write_pack(path, sections, meta=None):
+    """
+    Write a content pack from a dict of section -> {name: record}.
+
+    Records are encoded one at a time and the file is replaced atomically.
+    """
+    tables = {}
+    blobs = []
+    offset = 0
+    for section, records in sections.items():
+        keys = [name.encode('utf-8') for name in records]
+        spans = []
+        for blob in [json.dumps(record, separators=(',', ':')).encode('utf-8')
+                     for record in records.values()] + keys:
+            spans.append((offset, len(blob)))
+            blobs.append(blob)
+            offset += len(blob)
+        record_spans, key_spans = spans[:len(keys)], spans[len(keys):]
+
+        by_key = sorted(range(len(keys)), key=keys.__getitem__)
+        index = b''.join(_INDEX_ENTRY.pack(*key_spans[i], *record_spans[i]) for i in by_key)
+        positions = [0] * len(keys)
+        for position, i in enumerate(by_key):
+            positions[i] = position
+        order = b''.join(_ORDER_ENTRY.pack(position) for position in positions)
+
+        tables[section] = [len(keys), offset, offset + len(index)]
+        blobs += [index, order]
+        offset += len(index) + len(order)
+
+    header = json.dumps({'meta': meta or {}, 'sections': tables},
+                        separators=(',', ':')).encode('utf-8')
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(_PACK_PREAMBLE.pack(PACK_MAGIC, PACK_VERSION, len(header)))
+        file.write(header)
+        for blob in blobs:
+            file.write(blob)
+    os.replace(temp_path, path)
+
+
+def export_builtin_pack(path):
+    """Write the built-in GameData content, with difficulties and backgrounds, as a pack"""
+    from game_data import GameData
+    from game_assets import PUZZLE_DIFFICULTIES, ROOM_BACKGROUNDS
+
+    rooms = {}
+    for name, room in GameData.ROOMS.items():
+        rooms[name] = dict(room)
+        if name in ROOM_BACKGROUNDS:
+            rooms[name]['background'] = ROOM_BACKGROUNDS[name]
+    puzzles = {}
+    for name, puzzle in GameData.PUZZLES.items():
+        puzzles[name] = dict(puzzle)
+        if name in PUZZLE_DIFFICULTIES:
+            puzzles[name]['difficulty'] = PUZZLE_DIFFICULTIES[name]
+
+    write_pack(path, {
+        'rooms': rooms,
+        'puzzles': puzzles,
+        'items': GameData.ITEMS,
+        'messages': GameData.MESSAGES,
+    }, meta={'name': 'CryptoQuest'})
+
+
+if __name__ == "__main__":
+    import sys
+    target = sys.argv[1] if len(sys.argv) > 1 else 'cryptoquest.pack'
+    export_builtin_pack(target)
+    print(f"Wrote {target}")
@@ -0,0 +1,224 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Relative letter frequencies of English text, A to Z
+ENGLISH_FREQUENCIES = np.array([
+    0.08167, 0.01492, 0.02782, 0.04253, 0.12702, 0.02228, 0.02015,
+    0.06094, 0.06966, 0.00153, 0.00772, 0.04025, 0.02406, 0.06749,
+    0.07507, 0.01929, 0.00095, 0.05987, 0.06327, 0.09056, 0.02758,
+    0.00978, 0.02360, 0.00150, 0.01974, 0.00074
+])
+ENGLISH_FREQUENCIES = ENGLISH_FREQUENCIES / ENGLISH_FREQUENCIES.sum()
+_LOG_FREQUENCIES = np.log(ENGLISH_FREQUENCIES)
+
+# Alphabet index (0-25) of every byte, or -1 for anything that is not an ASCII letter
+_LETTER_INDEX = np.full(256, -1, dtype=np.int16)
+_LETTER_INDEX[np.arange(65, 91)] = np.arange(26)
+_LETTER_INDEX[np.arange(97, 123)] = np.arange(26)
+
+# Row c, column s refers to the plaintext letter that ciphertext letter c
+# decrypts to under shift s, so histogram @ matrix scores all shifts at once
+_DECRYPTED = (np.arange(26)[:, None] - np.arange(26)[None, :]) % 26
+_INVERSE_FREQUENCY_MATRIX = 1.0 / ENGLISH_FREQUENCIES[_DECRYPTED]
+_LOG_FREQUENCY_MATRIX = _LOG_FREQUENCIES[_DECRYPTED]
+
+# Expected index of coincidence of English text and of uniformly random letters
+ENGLISH_IOC = float((ENGLISH_FREQUENCIES ** 2).sum())
+RANDOM_IOC = 1 / 26
+
+CaesarCandidate = namedtuple('CaesarCandidate', ['shift', 'score'])
+KeyLengthCandidate = namedtuple('KeyLengthCandidate', ['length', 'ioc', 'kasiski'])
+VigenereCandidate = namedtuple('VigenereCandidate', ['key', 'score'])
+
+
+def letter_indices(text):
+    """Alphabet indices (0-25) of the ASCII letters in text, as an int array"""
+    if isinstance(text, str):
+        text = text.encode('utf-8')
+    indices = _LETTER_INDEX[np.frombuffer(text, dtype=np.uint8)]
+    return indices[indices >= 0]
+
+
+def letter_positions(text):
+    """
+    Alphabet indices (0-25) of the ASCII letters in text together with their
+    character positions, as two int arrays.
+    """
+    if text.isascii():
+        codes = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    else:
+        codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+        codes = np.where(codes < 256, codes, 0).astype(np.uint8)
+    indices = _LETTER_INDEX[codes]
+    positions = np.flatnonzero(indices >= 0)
+    return indices[positions], positions
+
+
+def score_shifts(counts, method='chi2'):
+    """
+    Score every Caesar shift from letter histograms.
+
+    `counts` has shape (..., 26). Returns an array of shape (..., 26) where
+    entry s scores the plaintext obtained by decrypting with shift s.
+    Lower is better for 'chi2', higher is better for 'log_likelihood'.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    if method == 'chi2':
+        # sum((O - E)^2 / E) expands to sum(O^2 / E) - N, with E = N * frequency
+        total = counts.sum(axis=-1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = (counts ** 2 @ _INVERSE_FREQUENCY_MATRIX) / total - total
+        return np.where(total > 0, scores, 0.0)
+    if method == 'log_likelihood':
+        return counts @ _LOG_FREQUENCY_MATRIX
+    raise ValueError(f"Unknown scoring method: {method}")
+
+
+def _ranking(scores, method):
+    """Indices that sort scores from best to worst"""
+    if method == 'log_likelihood':
+        return np.argsort(-scores, axis=-1, kind='stable')
+    return np.argsort(scores, axis=-1, kind='stable')
+
+
+class Cryptanalysis:
+    @staticmethod
+    def crack_caesar(ciphertext, method='chi2', top=None):
+        """
+        Rank all 26 Caesar shifts for a ciphertext.
+
+        The text is reduced to a single letter histogram and every shift is
+        scored from that histogram against English letter frequencies, so
+        the text is never decrypted. Returns a list of CaesarCandidate from
+        most to least likely; pass a candidate's shift to
+        CryptoTools.caesar_cipher(ciphertext, shift, decrypt=True).
+        """
+        counts = np.bincount(letter_indices(ciphertext), minlength=26)
+        scores = score_shifts(counts, method)
+        order = _ranking(scores, method)[:top]
+        return [CaesarCandidate(int(shift), float(scores[shift])) for shift in order]
+
+    @staticmethod
+    def crack_caesar_batch(ciphertexts, method='chi2'):
+        """
+        Find the most likely Caesar shift for many ciphertexts at once.
+
+        All texts are concatenated and histogrammed together in one bincount
+        over (text, letter) pairs. Returns one CaesarCandidate per text.
+        """
+        encoded = [text.encode('utf-8') if isinstance(text, str) else bytes(text)
+                   for text in ciphertexts]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        indices = _LETTER_INDEX[np.frombuffer(b''.join(encoded), dtype=np.uint8)]
+        text_ids = np.repeat(np.arange(len(encoded)), lengths)
+
+        is_letter = indices >= 0
+        counts = np.bincount(text_ids[is_letter] * 26 + indices[is_letter],
+                             minlength=len(encoded) * 26).reshape(len(encoded), 26)
+        scores = score_shifts(counts, method)
+        if method == 'log_likelihood':
+            best = scores.argmax(axis=-1)
+        else:
+            best = scores.argmin(axis=-1)
+        return [CaesarCandidate(int(shift), float(score))
+                for shift, score in zip(best, scores[np.arange(len(encoded)), best])]
+
+    @staticmethod
+    def estimate_key_length(ciphertext, max_length=20):
+        """
+        Rank Vigenère key lengths from 1 to max_length.
+
+        Each length is scored by the average index of coincidence of its key
+        columns and by the share of Kasiski distances (gaps between repeated
+        trigrams) it divides. Lengths whose IoC is close to the best one are
+        ranked first, ordered by Kasiski support and then by length, so a
+        multiple of the key length does not beat the key length itself.
+        Returns a list of KeyLengthCandidate.
+        """
+        letters, positions = letter_positions(ciphertext)
+        distances = _kasiski_distances(letters, positions)
+
+        candidates = []
+        for length in range(1, max(1, min(max_length, len(letters))) + 1):
+            columns = positions % length
+            counts = np.bincount(columns * 26 + letters, minlength=length * 26).reshape(length, 26)
+            totals = counts.sum(axis=1)
+            pairs = totals * (totals - 1)
+            used = pairs > 0
+            if used.any():
+                ioc = float(((counts * (counts - 1)).sum(axis=1)[used] / pairs[used]).mean())
+            else:
+                ioc = 0.0
+            kasiski = float(np.count_nonzero(distances % length == 0) / distances.size) if distances.size else 0.0
+            candidates.append(KeyLengthCandidate(length, ioc, kasiski))
+
+        best_ioc = max(candidate.ioc for candidate in candidates)
+        return sorted(candidates, key=lambda candidate: (
+            candidate.ioc < 0.9 * best_ioc, -candidate.kasiski, candidate.length))
+
+    @staticmethod
+    def crack_vigenere(ciphertext, max_key_length=20, candidates=1, processes=None):
+        """
+        Recover the key of a CryptoTools.vigenere_cipher ciphertext.
+
+        The most likely key lengths come from estimate_key_length; for each
+        one the text is split into key columns and every column is solved as
+        a Caesar cipher from its letter histogram. With `processes` the
+        candidate lengths are solved in a process pool. Returns a list of
+        VigenereCandidate(key, score) in key length rank order, where score
+        is the mean log-likelihood per letter of the decryption; pass the key
+        to CryptoTools.vigenere_cipher(ciphertext, key, decrypt=True).
+        """
+        letters, positions = letter_positions(ciphertext)
+        lengths = [candidate.length for candidate in
+                   Cryptanalysis.estimate_key_length(ciphertext, max_key_length)[:candidates]]
+
+        if processes and len(lengths) > 1:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                results = list(executor.map(_solve_vigenere_key,
+                                            [letters] * len(lengths), [positions] * len(lengths), lengths))
+        else:
+            results = [_solve_vigenere_key(letters, positions, length) for length in lengths]
+
+        unique = []
+        for result in results:
+            if result.key not in (candidate.key for candidate in unique):
+                unique.append(result)
+        return unique
+
+
+def _kasiski_distances(letters, positions):
+    """Distances between consecutive occurrences of every repeated trigram"""
+    if letters.size < 3:
+        return np.zeros(0, dtype=np.int64)
+    # Only trigrams of three adjacent characters, so distances stay in text positions
+    adjacent = positions[2:] - positions[:-2] == 2
+    codes = (letters[:-2] * 676 + letters[1:-1] * 26 + letters[2:])[adjacent]
+    starts = positions[:-2][adjacent]
+
+    order = np.argsort(codes, kind='stable')
+    codes, starts = codes[order], starts[order]
+    repeated = codes[1:] == codes[:-1]
+    return (starts[1:] - starts[:-1])[repeated]
+
+
+def _solve_vigenere_key(letters, positions, length):
+    """Solve every key column of the given length as a Caesar cipher"""
+    columns = positions % length
+    counts = np.bincount(columns * 26 + letters, minlength=length * 26).reshape(length, 26)
+    shifts = score_shifts(counts).argmin(axis=1)
+    likelihood = score_shifts(counts, 'log_likelihood')[np.arange(length), shifts].sum()
+
+    # vigenere_cipher decrypts ciphertext letter c with key character k to
+    # (ord('A') + c - ord(k)) % 26, so shift s comes from the lowercase
+    # letter whose ord is congruent to s + ord('A')
+    key = ''.join(chr(ord('a') + (shift + ord('A') - ord('a')) % 26) for shift in shifts)
+
+    # Collapse a key found at a multiple of its real length
+    for period in range(1, length):
+        if length % period == 0 and key == key[:period] * (length // period):
+            key = key[:period]
+            break
+    return VigenereCandidate(key, float(likelihood / max(1, letters.size)))
@@ -1,3 +1,114 @@
+import codecs
+import string
+from functools import lru_cache
+
+import binary_codec
+import morse_codec
+
+
+def _caesar_char(char, shift):
+    """Reference Caesar rule for a single character"""
+    if char.isalpha():
+        ascii_offset = ord('a') if char.islower() else ord('A')
+        return chr((ord(char) - ascii_offset + shift) % 26 + ascii_offset)
+    return char
+
+
+def _atbash_char(char):
+    """Reference Atbash rule for a single character"""
+    if char.isalpha():
+        if char.isupper():
+            return chr(90 - (ord(char) - 65))
+        return chr(122 - (ord(char) - 97))
+    return char
+
+
+class _TranslationTable(dict):
+    """
+    str.translate table for a single-character substitution rule.
+
+    ASCII is filled in up front; any other character is run through the
+    rule the first time it is seen and cached, so non-ASCII letters keep
+    exactly the behaviour of the original per-character loop.
+    """
+
+    def __init__(self, rule):
+        super().__init__()
+        self._rule = rule
+        for code in range(128):
+            self[code] = rule(chr(code))
+
+    def __missing__(self, code):
+        value = self._rule(chr(code))
+        self[code] = value
+        return value
+
+
+def _byte_table(rule):
+    """bytes.translate table for the ASCII letters of a substitution rule"""
+    table = bytearray(range(256))
+    for char in string.ascii_letters:
+        table[ord(char)] = ord(rule(char))
+    return bytes(table)
+
+
+# Translation tables for all 26 Caesar shifts and for Atbash, built once at import
+_CAESAR_TABLES = [_TranslationTable(lambda char, s=shift: _caesar_char(char, s))
+                  for shift in range(26)]
+_CAESAR_BYTE_TABLES = [_byte_table(lambda char, s=shift: _caesar_char(char, s))
+                       for shift in range(26)]
+_ATBASH_TABLE = _TranslationTable(_atbash_char)
+_ATBASH_BYTE_TABLE = _byte_table(_atbash_char)
+
+
+@lru_cache(maxsize=None)
+def _vigenere_table(key_value, decrypt):
+    """Translation table for one Vigenère key position (ord of the key character)"""
+    if decrypt:
+        key_value = -key_value
+
+    def rule(char):
+        if char.isalpha():
+            return chr((ord(char) + key_value) % 26 + ord('A'))
+        return char
+
+    return _TranslationTable(rule)
+
+
+def _vigenere_translate(text, key, decrypt=False, offset=0):
+    """
+    Apply Vigenère to text as if it started at key position `offset`.
+
+    Every key position is its own substitution, so each column of the text
+    (text[j::len(key)]) is translated in one pass and the columns are
+    interleaved back together.
+    """
+    if not key:
+        if any(char.isalpha() for char in text):
+            raise ValueError("Vigenère key must not be empty")
+        return text
+
+    key_length = len(key)
+    tables = [_vigenere_table(ord(i), decrypt) for i in key.lower()]
+    if key_length == 1 or len(text) <= 1:
+        return text.translate(tables[offset % key_length])
+
+    chars = list(text)
+    for column in range(key_length):
+        start = (column - offset) % key_length
+        chars[start::key_length] = text[start::key_length].translate(tables[column])
+    return ''.join(chars)
+
+
+def _read_chunks(file, chunk_size):
+    """Yield chunks from a file object until it is exhausted"""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
 class CryptoTools:
     @staticmethod
     def caesar_cipher(text, shift, decrypt=False):
@@ -6,84 +117,88 @@ class CryptoTools:
         """
         if decrypt:
             shift = -shift
-        
-        result = ""
-        for char in text:
-            if char.isalpha():
-                ascii_offset = ord('a') if char.islower() else ord('A')
-                result += chr((ord(char) - ascii_offset + shift) % 26 + ascii_offset)
-            else:
-                result += char
-        return result
+
+        if isinstance(text, (bytes, bytearray)):
+            return text.translate(_CAESAR_BYTE_TABLES[shift % 26])
+        return text.translate(_CAESAR_TABLES[shift % 26])
 
     @staticmethod
     def vigenere_cipher(text, key, decrypt=False):
         """
         Encrypt or decrypt text using Vigenère cipher
         """
-        result = ""
-        key_length = len(key)
-        key_as_int = [ord(i) for i in key.lower()]
-        text_int = [ord(i) for i in text]
-        
-        for i in range(len(text_int)):
-            if text[i].isalpha():
-                if decrypt:
-                    value = (text_int[i] - key_as_int[i % key_length]) % 26
-                else:
-                    value = (text_int[i] + key_as_int[i % key_length]) % 26
-                result += chr(value + ord('A'))
+        return _vigenere_translate(text, key, decrypt)
+
+    @staticmethod
+    def vigenere_stream(chunks, key, decrypt=False, chunk_size=1 << 16):
+        """
+        Encrypt or decrypt a stream using Vigenère cipher.
+
+        `chunks` is an iterable of str or bytes chunks, or a file object that
+        is read `chunk_size` at a time. Encrypted chunks are yielded as they
+        are produced and the key position carries over between chunks, so
+        the joined output equals vigenere_cipher on the joined input. bytes
+        are treated as UTF-8 and yielded back as UTF-8.
+        """
+        if hasattr(chunks, 'read'):
+            chunks = _read_chunks(chunks, chunk_size)
+
+        decoder = None
+        position = 0
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                text = chunk
+                result = _vigenere_translate(text, key, decrypt, position)
             else:
-                result += text[i]
-        return result
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder('utf-8')()
+                text = decoder.decode(chunk)
+                result = _vigenere_translate(text, key, decrypt, position).encode('utf-8')
+            if key:
+                position = (position + len(text)) % len(key)
+            if result:
+                yield result
+
+        if decoder is not None:
+            # Raises on a truncated multi-byte sequence at the end of the stream
+            decoder.decode(b'', final=True)
 
     @staticmethod
     def atbash_cipher(text):
         """
         Encrypt or decrypt text using Atbash cipher
         """
-        result = ""
-        for char in text:
-            if char.isalpha():
-                if char.isupper():
-                    result += chr(90 - (ord(char) - 65))
-                else:
-                    result += chr(122 - (ord(char) - 97))
-            else:
-                result += char
-        return result
+        if isinstance(text, (bytes, bytearray)):
+            return text.translate(_ATBASH_BYTE_TABLE)
+        return text.translate(_ATBASH_TABLE)
 
     @staticmethod
     def binary_to_text(binary):
         """
         Convert binary string to text
         """
-        binary = binary.replace(" ", "")
-        return ''.join(chr(int(binary[i:i+8], 2)) for i in range(0, len(binary), 8))
+        return binary_codec.bits_to_text(binary)
 
     @staticmethod
     def text_to_binary(text):
         """
         Convert text to binary string
         """
-        return ' '.join(format(ord(char), '08b') for char in text)
+        return binary_codec.text_to_bits(text)
 
     @staticmethod
     def morse_code(text, decrypt=False):
         """
         Convert between text and Morse code
         """
-        morse_dict = {
-            'A': '.-', 'B': '-...', 'C': '-.-.', 'D': '-..', 'E': '.', 'F': '..-.',
-            'G': '--.', 'H': '....', 'I': '..', 'J': '.---', 'K': '-.-', 'L': '.-..',
-            'M': '--', 'N': '-.', 'O': '---', 'P': '.--.', 'Q': '--.-', 'R': '.-.',
-            'S': '...', 'T': '-', 'U': '..-', 'V': '...-', 'W': '.--', 'X': '-..-',
-            'Y': '-.--', 'Z': '--..', ' ': ' '
-        }
-        
-        reverse_morse = {v: k for k, v in morse_dict.items()}
-        
         if decrypt:
-            return ' '.join(reverse_morse.get(code, '') for code in text.split())
+            return morse_codec.decode(text)
         else:
-            return ' '.join(morse_dict.get(char.upper(), '') for char in text) 
\ No newline at end of file
+            return morse_codec.encode(text)
+
+    @staticmethod
+    def morse_to_text(code):
+        """
+        Convert Morse code to text
+        """
+        return morse_codec.decode(code)
@@ -0,0 +1,100 @@
+import sys
+import tempfile
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from asset_fetcher import AssetFetcher
+
+# Body served for every asset path
+BODY = b'crypto quest asset'
+
+# Path -> Cache-Control header sent by the stand-in server
+CACHE_CONTROL = {
+    '/fresh.png': 'max-age=3600',
+    '/stale.png': 'max-age=0',
+    '/no-store.png': 'no-store',
+}
+
+ETAG = '"v1"'
+
+
+class _AssetHandler(BaseHTTPRequestHandler):
+    """Stand-in asset server that counts the requests it gets per path"""
+
+    requests = Counter()
+    not_modified = Counter()
+
+    def do_GET(self):
+        self.requests[self.path] += 1
+        if self.path not in CACHE_CONTROL:
+            self.send_error(404)
+            return
+        if self.headers.get('If-None-Match') == ETAG:
+            self.not_modified[self.path] += 1
+            self.send_response(304)
+            self.send_header('ETag', ETAG)
+            self.send_header('Cache-Control', CACHE_CONTROL[self.path])
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('ETag', ETAG)
+        self.send_header('Cache-Control', CACHE_CONTROL[self.path])
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _launch(cache_dir, base_url):
+    """One simulated game launch: a new fetcher over the same cache downloads every asset"""
+    with AssetFetcher(cache_dir=cache_dir) as fetcher:
+        urls = [base_url + path for path in list(CACHE_CONTROL) + ['/missing.png']]
+        return fetcher.fetch_many(urls)
+
+
+def check():
+    """Run the fetcher against a local server and return a list of failures (empty when all pass)"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _AssetHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    counts = _AssetHandler.requests
+    problems = []
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = _launch(cache_dir, base_url)
+            after_first = counts.copy()
+            second = _launch(cache_dir, base_url)
+            third = _launch(cache_dir, base_url)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    for label, bodies in (('first', first), ('second', second), ('third', third)):
+        for url, body in bodies.items():
+            expected = None if url.endswith('/missing.png') else BODY
+            if body != expected:
+                problems.append(f"{label} launch returned {body!r} for {url}")
+
+    later = counts - after_first
+    print(f"first launch: {sum(after_first.values())} requests, "
+          f"next two launches: {sum(later.values())} requests {dict(later)}")
+    if later['/fresh.png']:
+        problems.append(f"fresh asset re-requested {later['/fresh.png']} times")
+    if later['/stale.png'] != 2 or _AssetHandler.not_modified['/stale.png'] != 2:
+        problems.append(f"stale asset requested {later['/stale.png']} times with "
+                        f"{_AssetHandler.not_modified['/stale.png']} 304 responses, expected 2 of each")
+    if later['/no-store.png'] != 2 or _AssetHandler.not_modified['/no-store.png']:
+        problems.append(f"no-store asset requested {later['/no-store.png']} times, expected 2")
+    if later['/missing.png'] != 2:
+        problems.append(f"missing asset requested {later['/missing.png']} times, expected 2")
+    return problems
+
+
+if __name__ == "__main__":
+    problems = check()
+    for problem in problems:
+        print(f"Failed: {problem}")
+    sys.exit(1 if problems else 0)
@@ -1,13 +1,15 @@
 import os
 import sys
+import hashlib
+import struct
 from PIL import Image, ImageTk
-import requests
 from io import BytesIO
-import pygame
 import logging
+from asset_fetcher import get_fetcher
 
-# Initialize pygame for sound
-pygame.mixer.init()
+# pygame is imported and its mixer started by init_sound on first use, so
+# startup does not pay for the import or for probing the audio device
+_mixer = None
 
 # Modern color scheme
 COLORS = {
@@ -53,51 +55,149 @@ PUZZLE_DIFFICULTIES = {
     'vault_puzzle': 'easy'
 }
 
+def init_sound():
+    """Start the pygame mixer on first use and return it, or None if there is no audio"""
+    global _mixer
+    if _mixer is None:
+        try:
+            import pygame
+            pygame.mixer.init()
+            _mixer = pygame.mixer
+        except Exception as e:
+            logging.warning(f"Sound disabled: {e}")
+            _mixer = False
+    return _mixer or None
+
+def _image_from_bytes(data, size=None):
+    image = Image.open(BytesIO(data))
+    if size:
+        image = image.resize(size, Image.Resampling.LANCZOS)
+    return ImageTk.PhotoImage(image)
+
 def download_image(url, size=None):
-    """Download and resize an image from URL"""
+    """Download and resize an image from URL, using the shared download cache"""
     try:
         print(f"Downloading image from {url}")
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers)
-        image = Image.open(BytesIO(response.content))
-        if size:
-            image = image.resize(size, Image.Resampling.LANCZOS)
-        return ImageTk.PhotoImage(image)
+        return _image_from_bytes(get_fetcher().fetch(url), size)
     except Exception as e:
         print(f"Error downloading image {url}: {e}")
         return None
 
+def download_images(urls, size=None):
+    """Download several images concurrently; returns url -> PhotoImage or None"""
+    images = {}
+    for url, data in get_fetcher().fetch_many(urls).items():
+        try:
+            images[url] = _image_from_bytes(data, size) if data is not None else None
+        except Exception as e:
+            print(f"Error decoding image {url}: {e}")
+            images[url] = None
+    return images
+
+# Dark overlay composited over every loaded image
+IMAGE_OVERLAY = (0, 0, 0, 64)
+
+# Processed images are cached here as raw RGBA pixels
+THUMBNAIL_CACHE_DIR = os.environ.get(
+    'CRYPTOQUEST_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'cryptoquest', 'thumbnails'))
+
+# Bump when the processing steps change so old cache entries are ignored
+_THUMBNAIL_VERSION = 1
+
+# Width and height of a cached image, ahead of its pixels
+_THUMBNAIL_HEADER = struct.Struct('<II')
+
+def get_asset_path(filename):
+    """Absolute path of a bundled asset"""
+    # Check if we're running as a bundled executable
+    if getattr(sys, 'frozen', False):
+        # We're running in a bundle
+        base_path = sys._MEIPASS
+    else:
+        # We're running in normal Python environment
+        base_path = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_path, filename)
+
+def _thumbnail_cache_paths(full_path, size):
+    """
+    Cache file for an image and the prefix shared by all versions of it.
+
+    The prefix hashes the source path and styling parameters, the suffix
+    hashes the source mtime and size, so editing an asset changes the file
+    name and stale versions can be found by prefix.
+    """
+    stat = os.stat(full_path)
+    source = f"{_THUMBNAIL_VERSION}|{full_path}|{size}|{IMAGE_OVERLAY}"
+    version = f"{stat.st_mtime_ns}|{stat.st_size}"
+    prefix = hashlib.sha256(source.encode('utf-8')).hexdigest()[:24]
+    suffix = hashlib.sha256(version.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(THUMBNAIL_CACHE_DIR, f"{prefix}-{suffix}.rgba"), prefix
+
+def _read_thumbnail(cache_path):
+    """Load a cached image, or None if it is missing or unreadable"""
+    try:
+        with open(cache_path, 'rb') as file:
+            data = file.read()
+        width, height = _THUMBNAIL_HEADER.unpack_from(data)
+        pixels = memoryview(data)[_THUMBNAIL_HEADER.size:]
+        if len(pixels) != width * height * 4:
+            return None
+        return Image.frombuffer('RGBA', (width, height), pixels, 'raw', 'RGBA', 0, 1)
+    except (OSError, struct.error):
+        return None
+
+def _write_thumbnail(cache_path, prefix, image):
+    """Store a processed image and drop older versions of the same source"""
+    try:
+        os.makedirs(THUMBNAIL_CACHE_DIR, exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(_THUMBNAIL_HEADER.pack(*image.size))
+            file.write(image.tobytes())
+        os.replace(temp_path, cache_path)
+
+        name = os.path.basename(cache_path)
+        for entry in os.listdir(THUMBNAIL_CACHE_DIR):
+            if entry.startswith(prefix) and entry != name and entry.endswith('.rgba'):
+                os.remove(os.path.join(THUMBNAIL_CACHE_DIR, entry))
+    except OSError as e:
+        logging.warning(f"Could not cache image {cache_path}: {str(e)}")
+
+def prepare_image(filename, size=None):
+    """
+    Load, resize and style an image as a PIL image.
+
+    The result is cached on disk keyed by the source file and styling, so
+    later launches skip decoding, resizing and compositing.
+    """
+    full_path = get_asset_path(filename)
+    cache_path, prefix = _thumbnail_cache_paths(full_path, size)
+    image = _read_thumbnail(cache_path)
+    if image is not None:
+        return image
+
+    # Load the image
+    image = Image.open(full_path)
+
+    # Resize if size is specified
+    if size:
+        image = image.resize(size, Image.Resampling.LANCZOS)
+
+    # Apply modern styling
+    image = image.convert('RGBA')
+
+    # Create a new image with a dark overlay
+    overlay = Image.new('RGBA', image.size, IMAGE_OVERLAY)
+    image = Image.alpha_composite(image, overlay)
+
+    _write_thumbnail(cache_path, prefix, image)
+    return image
+
 def load_image(filename, size=None):
     """Load an image with error handling and modern styling"""
     try:
-        # Check if we're running as a bundled executable
-        if getattr(sys, 'frozen', False):
-            # We're running in a bundle
-            base_path = sys._MEIPASS
-        else:
-            # We're running in normal Python environment
-            base_path = os.path.dirname(os.path.abspath(__file__))
-        
-        # Construct the full path
-        full_path = os.path.join(base_path, filename)
-        
-        # Load the image
-        image = Image.open(full_path)
-        
-        # Resize if size is specified
-        if size:
-            image = image.resize(size, Image.Resampling.LANCZOS)
-        
-        # Apply modern styling
-        image = image.convert('RGBA')
-        
-        # Create a new image with a dark overlay
-        overlay = Image.new('RGBA', image.size, (0, 0, 0, 64))
-        image = Image.alpha_composite(image, overlay)
-        
-        return ImageTk.PhotoImage(image)
+        return ImageTk.PhotoImage(prepare_image(filename, size))
     except Exception as e:
         logging.error(f"Error loading image {filename}: {str(e)}")
         # Return a default image or None
@@ -1,4 +1,19 @@
+import os
+
+from content_pack import SECTIONS, ContentPack
+
+# Content pack loaded instead of the built-in content when set
+CONTENT_PACK_ENV = 'CRYPTOQUEST_CONTENT_PACK'
+
+
 class GameData:
+    """
+    Game content. The class attributes hold the built-in game; passing a
+    content pack path (or setting CRYPTOQUEST_CONTENT_PACK) replaces any
+    section the pack provides with a lazily loaded mapping, so only the
+    pack index is read at startup.
+    """
+
     # Room descriptions and available items
     ROOMS = {
         'entrance': {
@@ -127,4 +142,29 @@ Modern cryptography is essential for:
         'puzzle_solved': 'Congratulations! You solved the puzzle!',
         'puzzle_failed': 'That\'s not the correct solution. Try again!',
         'game_complete': 'Congratulations! You have found the treasure and completed the game!'
-    } 
\ No newline at end of file
+    } 
+
+    def __init__(self, pack_path=None):
+        self.pack = None
+        self._room_order = None
+        pack_path = pack_path or os.environ.get(CONTENT_PACK_ENV)
+        if pack_path:
+            self.pack = ContentPack(pack_path)
+            for section in SECTIONS:
+                if section in self.pack:
+                    setattr(self, section.upper(), self.pack[section])
+
+    def room_order(self):
+        """Room names in order and a name -> position map, built once and shared"""
+        if self._room_order is None:
+            order = list(self.ROOMS)
+            self._room_order = order, {room: index for index, room in enumerate(order)}
+        return self._room_order
+
+    def puzzle_difficulty(self, puzzle_name, default=None):
+        """The puzzle's optional 'difficulty' field"""
+        return self.PUZZLES[puzzle_name].get('difficulty', default)
+
+    def room_background(self, room, default=None):
+        """The room's optional 'background' image path"""
+        return self.ROOMS[room].get('background', default)
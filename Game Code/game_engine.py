@@ -0,0 +1,192 @@
+import time
+
+from game_data import GameData
+
+# Points awarded for each achievement
+ACHIEVEMENT_POINTS = 100
+
+
+class GameEngine:
+    """
+    The rules of Crypto Quest without any user interface.
+
+    The engine owns the player state (room, inventory, solved puzzles,
+    score, achievements) and answers every game action with a plain
+    result, leaving dialogs and messages to the view. Room contents are
+    copy-on-write: GameData is never modified, and a room's item list is
+    only copied the first time an item is taken from it, so many engines
+    can share one GameData and its cached room order. An optional
+    SaveGame receives every action.
+    """
+
+    def __init__(self, game_data=None, journal=None, start_room='entrance'):
+        self.game_data = game_data or GameData()
+        self.journal = journal
+        self.current_room = start_room
+        self.inventory = []
+        self.solved_puzzles = set()
+        self.score = 0
+        self.achievements = set()
+        # room -> item list, for rooms whose items have changed
+        self._room_items = {}
+        self._room_order, self._room_index = self.game_data.room_order()
+
+    def _record(self, action, **fields):
+        if self.journal is not None:
+            self.journal.record(action, **fields)
+
+    def restore(self, state):
+        """Apply a saved state (see save_game.new_state)"""
+        if state['current_room'] in self._room_index:
+            self.current_room = state['current_room']
+        self.inventory = list(state['inventory'])
+        self.solved_puzzles = set(state['solved_puzzles'])
+        self.score = state['score']
+        self.achievements = set(state['achievements'])
+        for room, items in state['taken'].items():
+            if room not in self._room_index:
+                continue
+            room_items = self._writable_items(room)
+            for item in items:
+                if item in room_items:
+                    room_items.remove(item)
+
+    def room_items(self, room=None):
+        """Items currently lying in a room, the current room by default"""
+        room = room or self.current_room
+        items = self._room_items.get(room)
+        if items is None:
+            items = self.game_data.ROOMS[room]['items']
+        return items
+
+    def _writable_items(self, room):
+        items = self._room_items.get(room)
+        if items is None:
+            items = self._room_items[room] = list(self.game_data.ROOMS[room]['items'])
+        return items
+
+    @property
+    def progress(self):
+        """Percentage of puzzles solved"""
+        return len(self.solved_puzzles) / len(self.game_data.PUZZLES) * 100
+
+    @property
+    def complete(self):
+        return len(self.solved_puzzles) == len(self.game_data.PUZZLES)
+
+    def take_item(self, item):
+        """Move an item from the current room to the inventory; False if it is not there"""
+        if item not in self.room_items():
+            return False
+        self._writable_items(self.current_room).remove(item)
+        self.inventory.append(item)
+        self._record('take', room=self.current_room, item=item)
+        return True
+
+    def current_puzzle(self):
+        """First unsolved puzzle in the current room, or None"""
+        for puzzle in self.game_data.ROOMS[self.current_room]['puzzles']:
+            if puzzle not in self.solved_puzzles:
+                return puzzle
+        return None
+
+    @staticmethod
+    def check_answer(puzzle, answer):
+        """Whether answer solves the puzzle (case-insensitive)"""
+        return answer.upper() == puzzle['solution']
+
+    def solve_puzzle(self, puzzle_name, answer):
+        """
+        Attempt a puzzle. On success the puzzle is marked solved and its
+        reward added to the inventory. Raises KeyError for unknown puzzles.
+        """
+        puzzle = self.game_data.PUZZLES[puzzle_name]
+        if not self.check_answer(puzzle, answer):
+            return False
+        self.mark_solved(puzzle_name)
+        return True
+
+    def mark_solved(self, puzzle_name):
+        """Record a puzzle as solved and collect its reward"""
+        if puzzle_name in self.solved_puzzles:
+            return
+        reward = self.game_data.PUZZLES[puzzle_name]['reward']
+        self.solved_puzzles.add(puzzle_name)
+        if reward:
+            self.inventory.append(reward)
+        self._record('solve', puzzle=puzzle_name, reward=reward)
+
+    def check_achievements(self):
+        """Award any newly earned achievements and return their names"""
+        total_puzzles = len(self.game_data.PUZZLES)
+        achievements = {
+            'first_puzzle': len(self.solved_puzzles) >= 1,
+            'half_way': len(self.solved_puzzles) >= total_puzzles // 2,
+            'master_cryptographer': len(self.solved_puzzles) == total_puzzles,
+            'treasure_hunter': 'treasure' in self.inventory
+        }
+
+        unlocked = []
+        for achievement, condition in achievements.items():
+            if condition and achievement not in self.achievements:
+                self.achievements.add(achievement)
+                self.score += ACHIEVEMENT_POINTS
+                self._record('achievement', name=achievement, points=ACHIEVEMENT_POINTS)
+                unlocked.append(achievement)
+        return unlocked
+
+    def move_to(self, index):
+        """Move to the room at index in the room order; False if there is none"""
+        if not 0 <= index < len(self._room_order):
+            return False
+        self.current_room = self._room_order[index]
+        self._record('move', room=self.current_room)
+        return True
+
+    def previous_room(self):
+        return self.move_to(self._room_index[self.current_room] - 1)
+
+    def next_room(self):
+        return self.move_to(self._room_index[self.current_room] + 1)
+
+    def use_item(self, item):
+        """
+        Use an inventory item. Returns 'used' when there is an unsolved
+        puzzle here, 'no_puzzle' when there is not, 'unusable' for items
+        that cannot be used and 'missing' when the item is not held.
+        """
+        if item not in self.inventory:
+            return 'missing'
+        if not self.game_data.ITEMS[item]['usable']:
+            return 'unusable'
+        return 'used' if self.current_puzzle() else 'no_puzzle'
+
+
+def simulate_playthrough(engine):
+    """
+    Play a game to the end: in every room take all items and solve the
+    puzzles with their solutions, then move on. Returns the engine.
+    """
+    while True:
+        for item in list(engine.room_items()):
+            engine.take_item(item)
+        puzzle = engine.current_puzzle()
+        while puzzle is not None:
+            engine.solve_puzzle(puzzle, engine.game_data.PUZZLES[puzzle]['solution'])
+            engine.check_achievements()
+            puzzle = engine.current_puzzle()
+        if not engine.next_room():
+            return engine
+
+
+def benchmark(playthroughs=10000, game_data=None):
+    """Playthroughs per second of simulate_playthrough on fresh engines"""
+    game_data = game_data or GameData()
+    start = time.perf_counter()
+    for _ in range(playthroughs):
+        simulate_playthrough(GameEngine(game_data))
+    return playthroughs / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    print(f"{benchmark():,.0f} playthroughs per second")
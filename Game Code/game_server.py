@@ -0,0 +1,258 @@
+import argparse
+import asyncio
+import json
+import logging
+
+from game_data import GameData
+from game_engine import GameEngine
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 7777
+
+# Longest command line accepted from a client, in bytes
+MAX_LINE = 4096
+
+# Unflushed output a session may queue before it waits for the client to read
+WRITE_HIGH_WATER = 64 * 1024
+
+
+def parse_command(line):
+    """
+    Split a request line into (command, arguments).
+
+    A line is either plain text such as "take note" or a JSON object such
+    as {"cmd": "take", "args": ["note"]}. Raises ValueError for malformed
+    JSON requests.
+    """
+    line = line.strip()
+    if line.startswith('{'):
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("A JSON command must be an object")
+        args = request.get('args', [])
+        if isinstance(args, str):
+            args = args.split()
+        elif not isinstance(args, list):
+            raise ValueError("args must be a list or a string")
+        return str(request.get('cmd', '')).lower(), [str(arg) for arg in args]
+    words = line.split()
+    if not words:
+        return '', []
+    return words[0].lower(), words[1:]
+
+
+class GameSession:
+    """One player's game: turns protocol commands into GameEngine calls"""
+
+    def __init__(self, game_data):
+        self.game_data = game_data
+        self.engine = GameEngine(game_data)
+
+    def handle(self, command, args):
+        """Run a command and return the response dict"""
+        handler = self.COMMANDS.get(command)
+        if handler is None:
+            return {'ok': False, 'error': self.game_data.MESSAGES['invalid_command']}
+        return handler(self, args)
+
+    def look(self, args):
+        engine = self.engine
+        room = self.game_data.ROOMS[engine.current_room]
+        return {
+            'ok': True,
+            'room': engine.current_room,
+            'description': room['description'],
+            'items': list(engine.room_items()),
+            'puzzles': [puzzle for puzzle in room['puzzles'] if puzzle not in engine.solved_puzzles],
+            'exits': room['exits'],
+        }
+
+    def inventory(self, args):
+        engine = self.engine
+        return {
+            'ok': True,
+            'inventory': list(engine.inventory),
+            'score': engine.score,
+            'achievements': sorted(engine.achievements),
+            'progress': engine.progress,
+        }
+
+    def take(self, args):
+        if not args:
+            return {'ok': False, 'error': "Usage: take <item>"}
+        item = args[0]
+        if not self.engine.take_item(item):
+            return {'ok': False, 'error': self.game_data.MESSAGES['item_not_found']}
+        return {'ok': True, 'item': item, 'description': self.game_data.ITEMS[item]['description']}
+
+    def use(self, args):
+        if not args:
+            return {'ok': False, 'error': "Usage: use <item>"}
+        item = args[0]
+        outcome = self.engine.use_item(item)
+        if outcome == 'missing':
+            return {'ok': False, 'error': "Item not in inventory"}
+        if outcome == 'unusable':
+            return {'ok': False, 'error': f"Can't use {item}"}
+        return {'ok': True, 'item': item, 'outcome': outcome,
+                'info': self.game_data.ITEMS[item]['educational_info']}
+
+    def solve(self, args):
+        """solve <puzzle> shows the puzzle, solve <puzzle> <answer> attempts it"""
+        if not args:
+            return {'ok': False, 'error': "Usage: solve <puzzle> [answer]"}
+        name = args[0]
+        engine = self.engine
+        if name not in self.game_data.ROOMS[engine.current_room]['puzzles'] or name not in self.game_data.PUZZLES:
+            return {'ok': False, 'error': self.game_data.MESSAGES['puzzle_not_found']}
+        puzzle = self.game_data.PUZZLES[name]
+        if len(args) == 1:
+            return {'ok': True, 'puzzle': name, 'type': puzzle['type'],
+                    'encrypted_text': puzzle['encrypted_text'], 'hint': puzzle['hint'],
+                    'solved': name in engine.solved_puzzles}
+        if not engine.solve_puzzle(name, ' '.join(args[1:])):
+            return {'ok': False, 'puzzle': name, 'error': self.game_data.MESSAGES['puzzle_failed']}
+        return {'ok': True, 'puzzle': name, 'message': self.game_data.MESSAGES['puzzle_solved'],
+                'reward': puzzle['reward'], 'achievements': engine.check_achievements(),
+                'complete': engine.complete}
+
+    def move(self, args, forward=True):
+        moved = self.engine.next_room() if forward else self.engine.previous_room()
+        if not moved:
+            return {'ok': False, 'error': "There is no room in that direction"}
+        return self.look(args)
+
+    def previous(self, args):
+        return self.move(args, forward=False)
+
+    def restart(self, args):
+        self.engine = GameEngine(self.game_data)
+        return self.look(args)
+
+    def help(self, args):
+        return {'ok': True, 'message': self.game_data.MESSAGES['help']}
+
+    COMMANDS = {
+        'look': look,
+        'inventory': inventory,
+        'take': take,
+        'use': use,
+        'solve': solve,
+        'next': move,
+        'previous': previous,
+        'restart': restart,
+        'help': help,
+    }
+
+
+class GameServer:
+    """
+    Asyncio server hosting one GameSession per TCP connection.
+
+    Clients send one command per line and get one JSON object per line
+    back. All sessions share a single GameData, and the engine's
+    copy-on-write room items keep an idle session down to a few small
+    objects plus its connection, so tens of thousands can stay open in
+    one process. Output is only awaited once a client falls behind by
+    WRITE_HIGH_WATER bytes, so a burst of commands is answered without a
+    drain per line.
+    """
+
+    def __init__(self, game_data=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.game_data = game_data or GameData()
+        self.host = host
+        self.port = port
+        self.sessions = 0
+        self.commands = 0
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve, self.host, self.port,
+                                                  limit=MAX_LINE, backlog=4096)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _serve(self, reader, writer):
+        session = GameSession(self.game_data)
+        self.sessions += 1
+        try:
+            self._send(writer, {'ok': True, 'message': self.game_data.MESSAGES['welcome']})
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    self._send(writer, {'ok': False, 'error': "Command too long"})
+                    break
+                if not line:
+                    break
+                try:
+                    command, args = parse_command(line.decode('utf-8', 'replace'))
+                except ValueError as e:
+                    response = {'ok': False, 'error': f"Malformed JSON command: {str(e)}"}
+                else:
+                    if command == 'quit':
+                        self._send(writer, {'ok': True, 'message': "Goodbye"})
+                        break
+                    if not command:
+                        continue
+                    try:
+                        response = session.handle(command, args)
+                    except Exception as e:
+                        # A bad content pack record should fail the command, not the connection
+                        logging.exception(f"Error handling {command!r}")
+                        response = {'ok': False, 'error': f"Internal error: {str(e)}"}
+                self.commands += 1
+                self._send(writer, response)
+                if writer.transport.get_write_buffer_size() > WRITE_HIGH_WATER:
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    @staticmethod
+    def _send(writer, response):
+        writer.write(json.dumps(response, separators=(',', ':')).encode('utf-8') + b'\n')
+
+
+async def _report(server, interval):
+    last = server.commands
+    while True:
+        await asyncio.sleep(interval)
+        rate = (server.commands - last) / interval
+        last = server.commands
+        print(f"{server.sessions} sessions, {rate:,.0f} commands/s")
+
+
+async def _main(args):
+    server = await GameServer(GameData(args.pack), args.host, args.port).start()
+    print(f"Crypto Quest server listening on {server.host}:{server.port}")
+    if args.stats:
+        asyncio.ensure_future(_report(server, args.stats))
+    await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Crypto Quest multi-session game server")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--pack', help="content pack to serve instead of the built-in game")
+    parser.add_argument('--stats', type=float, default=0, metavar='SECONDS',
+                        help="print session and command counts every SECONDS")
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
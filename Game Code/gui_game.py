@@ -1,18 +1,25 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
-import os
-from PIL import Image, ImageTk
-import json
+from PIL import ImageTk
 from crypto_tools import CryptoTools
+from preview_cache import CipherCache, VigenerePreview, changed_ranges
 from game_data import GameData
-import pyfiglet
-from colorama import Fore, Style
+from save_game import SaveGame
+from game_engine import GameEngine
 from game_assets import (
     COLORS, ROOM_BACKGROUNDS, ITEM_ICONS,
-    PUZZLE_DIFFICULTIES, load_image,
+    PUZZLE_DIFFICULTIES, prepare_image,
     get_difficulty_color
 )
 import math
+from concurrent.futures import ThreadPoolExecutor
+
+# Quiet period after the last keystroke before the Vigenère preview is recomputed
+VIGENERE_PREVIEW_DELAY_MS = 80
+
+# Background image loading: worker threads and how often finished loads are collected
+IMAGE_LOADER_THREADS = 4
+IMAGE_POLL_MS = 30
 
 class ModernButton(ttk.Button):
     def __init__(self, master=None, **kwargs):
@@ -26,6 +33,251 @@ class ModernButton(ttk.Button):
     def on_leave(self, e):
         self.configure(style='TButton')
 
+def copy_keys(items):
+    """
+    One key per entry of an item list: the item and how many copies of it
+    come before. Keying widgets by the item alone would give duplicates one.
+    """
+    copies = {}
+    keys = []
+    for item in items:
+        keys.append((item, copies.get(item, 0)))
+        copies[item] = copies.get(item, 0) + 1
+    return keys
+
+class RoomScene:
+    """
+    Retained contents of the room canvas.
+
+    The background image and one frame per item copy are kept between
+    updates; show() compares the new item list with what is on the canvas
+    and only creates, destroys, moves or re-icons the items that differ.
+    """
+
+    def __init__(self, canvas, on_hover, on_leave, on_click):
+        self.canvas = canvas
+        self.on_hover = on_hover
+        self.on_leave = on_leave
+        self.on_click = on_click
+        self.background_id = None
+        self.background = None
+        # (item, copy number) -> [frame, canvas window id, icon label or None, icon image, position]
+        self.items = {}
+
+    def set_background(self, image):
+        if image is self.background:
+            return
+        self.background = image
+        if self.background_id is None:
+            if image is None:
+                return
+            self.background_id = self.canvas.create_image(0, 0, image=image, anchor="nw")
+            self.canvas.tag_lower(self.background_id)
+        else:
+            self.canvas.itemconfigure(self.background_id, image=image or '')
+
+    def show(self, items, images):
+        """Bring the canvas in line with items, touching only what changed"""
+        keys = copy_keys(items)
+        wanted = set(keys)
+        for key in [key for key in self.items if key not in wanted]:
+            frame, window_id = self.items.pop(key)[:2]
+            self.canvas.delete(window_id)
+            frame.destroy()
+
+        for key, position in zip(keys, self.layout(items)):
+            item = key[0]
+            entry = self.items.get(key)
+            if entry is None:
+                self.items[key] = self.create_item(item, images.get(item), position)
+                continue
+            if entry[4] != position:
+                self.canvas.coords(entry[1], *position)
+                entry[4] = position
+            image = images.get(item)
+            if image is not entry[3]:
+                self.set_icon(entry, image)
+
+    def layout(self, items):
+        """Positions of the items: centred when alone, otherwise in a circle"""
+        canvas_width = self.canvas.winfo_width()
+        canvas_height = self.canvas.winfo_height()
+        center_x = canvas_width // 2
+        center_y = canvas_height // 2
+        if len(items) == 1:
+            return [(max(50, min(center_x, canvas_width - 50)),
+                     max(50, min(center_y, canvas_height - 50)))]
+
+        # Use a smaller radius to ensure items stay within bounds
+        radius = min(canvas_width, canvas_height) // 4
+        angle_step = 360 / max(len(items), 1)
+        positions = []
+        for i in range(len(items)):
+            angle = math.radians(i * angle_step)
+            x = center_x + radius * math.cos(angle)
+            y = center_y + radius * math.sin(angle)
+            positions.append((max(50, min(x, canvas_width - 50)),
+                              max(50, min(y, canvas_height - 50))))
+        return positions
+
+    def create_item(self, item, image, position):
+        item_frame = ttk.Frame(self.canvas, style='TFrame')
+        item_frame.bind('<Enter>', lambda e, i=item: self.on_hover(e, i))
+        item_frame.bind('<Leave>', lambda e: self.on_leave(e))
+        item_frame.bind('<Button-1>', lambda e, i=item: self.on_click(i))
+
+        name_label = ttk.Label(item_frame, text=item, style='TLabel')
+        name_label.pack(pady=5)
+
+        window_id = self.canvas.create_window(*position,
+                                              window=item_frame,
+                                              anchor="center",
+                                              tags=("item", item))
+        entry = [item_frame, window_id, None, None, position]
+        self.set_icon(entry, image)
+        return entry
+
+    def set_icon(self, entry, image):
+        entry[3] = image
+        if entry[2] is None:
+            if image is None:
+                return
+            name_label = entry[0].winfo_children()[0]
+            entry[2] = ttk.Label(entry[0], style='TLabel')
+            entry[2].pack(pady=5, before=name_label)
+        entry[2].configure(image=image or '')
+        entry[2].image = image
+
+class InventoryPanel:
+    """
+    Retained inventory rows.
+
+    One row per inventory entry is kept, keyed by the item and how many
+    copies of it came before; show() destroys rows for entries that left
+    the inventory and appends rows for new ones, leaving the rest untouched.
+    """
+
+    def __init__(self, frame, canvas, descriptions, on_use):
+        self.frame = frame
+        self.canvas = canvas
+        self.descriptions = descriptions
+        self.on_use = on_use
+        # (item, copy number) -> [row frame, icon label or None, icon image]
+        self.rows = {}
+        self.empty_label = ttk.Label(frame, text="Your inventory is empty.", style='TLabel')
+
+    def show(self, inventory, images):
+        """Bring the rows in line with inventory, touching only what changed"""
+        changed = False
+        keys = copy_keys(inventory)
+        wanted = set(keys)
+        for key in [key for key in self.rows if key not in wanted]:
+            self.rows.pop(key)[0].destroy()
+            changed = True
+
+        for key in keys:
+            item = key[0]
+            row = self.rows.get(key)
+            if row is None:
+                self.rows[key] = self.create_row(item, images.get(item))
+                changed = True
+            elif images.get(item) is not row[2]:
+                self.set_icon(row, images.get(item))
+
+        if inventory:
+            self.empty_label.pack_forget()
+        elif not self.empty_label.winfo_manager():
+            self.empty_label.pack(pady=5)
+            changed = True
+
+        if changed:
+            self.frame.update_idletasks()
+            self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+
+    def create_row(self, item, image):
+        item_frame = ttk.Frame(self.frame, style='TFrame')
+        item_frame.pack(fill=tk.X, pady=2)
+
+        description = ttk.Label(item_frame,
+                                text=f"{item}: {self.descriptions[item]['description']}",
+                                style='TLabel')
+        description.pack(side=tk.LEFT)
+
+        # Add use button
+        use_button = ModernButton(item_frame,
+                                  text="Use",
+                                  command=lambda i=item: self.on_use(i))
+        use_button.pack(side=tk.RIGHT, padx=5)
+
+        row = [item_frame, None, None]
+        self.set_icon(row, image)
+        return row
+
+    def set_icon(self, row, image):
+        row[2] = image
+        if row[1] is None:
+            if image is None:
+                return
+            description = row[0].winfo_children()[0]
+            row[1] = ttk.Label(row[0], style='TLabel')
+            row[1].pack(side=tk.LEFT, padx=5, before=description)
+        row[1].configure(image=image or '')
+        row[1].image = image
+
+class CharPreview:
+    """
+    Character-by-character preview drawn in a single Text widget.
+
+    show() rewrites only the ranges that differ from what is displayed,
+    and the success colour is one tag over the whole text, so updates stay
+    cheap for very long messages. When too many scattered ranges change a
+    single full replacement is faster than many small edits.
+    """
+
+    # Above this many changed ranges the whole text is replaced at once
+    MAX_RANGES = 64
+
+    def __init__(self, master):
+        self.widget = tk.Text(master,
+                              height=4,
+                              width=60,
+                              wrap=tk.CHAR,
+                              bg=COLORS['background'],
+                              fg=COLORS['text'],
+                              font=('Helvetica', 12),
+                              relief='flat',
+                              borderwidth=0,
+                              highlightthickness=0)
+        self.widget.tag_configure('correct', foreground=COLORS['success'])
+        self.widget.configure(state='disabled')
+        self.content = ''
+        self.highlighted = False
+
+    def pack(self, **kwargs):
+        self.widget.pack(**kwargs)
+
+    def show(self, content, highlight=False):
+        """Display content, coloured as correct when highlight is set"""
+        tags = ('correct',) if highlight else ()
+        ranges = changed_ranges(self.content, content)
+        self.widget.configure(state='normal')
+        if ranges is None or len(ranges) > self.MAX_RANGES:
+            self.widget.delete('1.0', tk.END)
+            self.widget.insert('1.0', content, tags)
+        else:
+            for start, end in ranges:
+                first = f'1.0 + {start} chars'
+                self.widget.delete(first, f'1.0 + {end} chars')
+                self.widget.insert(first, content[start:end], tags)
+        if highlight != self.highlighted:
+            if highlight:
+                self.widget.tag_add('correct', '1.0', tk.END)
+            else:
+                self.widget.tag_remove('correct', '1.0', tk.END)
+        self.widget.configure(state='disabled')
+        self.content = content
+        self.highlighted = highlight
+
 class CryptoQuestGUI:
     def __init__(self, root):
         self.root = root
@@ -34,18 +286,27 @@ class CryptoQuestGUI:
         self.root.configure(bg=COLORS['background'])
 
         # Initialize game state
-        self.current_room = 'entrance'
-        self.inventory = []
-        self.solved_puzzles = set()
         self.crypto_tools = CryptoTools()
+        self.preview_cache = CipherCache()
+        self.vigenere_preview = None
+        self.vigenere_preview_job = None
+        self.puzzle_panels = {}
+        self.current_panel = None
+        self.current_puzzle = None
         self.game_data = GameData()
-        self.progress = 0
-        self.score = 0
-        self.achievements = set()
+
+        # The engine holds the game state and rules; restore the saved game, if there is one
+        self.save_game = SaveGame()
+        self.engine = GameEngine(self.game_data, journal=self.save_game)
+        self.engine.restore(self.save_game.load())
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # Initialize image storage
         self.room_images = {}
         self.item_images = {}
+        self.image_executor = ThreadPoolExecutor(max_workers=IMAGE_LOADER_THREADS)
+        self.pending_images = {}
+        self.image_poll_job = None
         
         # Load images and create styles
         self.load_images()
@@ -62,24 +323,74 @@ class CryptoQuestGUI:
         self.update_room_display()
         self.update_inventory_display()
         self.update_progress()
+        self.update_score()
+        self.schedule_image_poll()
+
+    def on_close(self):
+        """Save the game and close the window"""
+        try:
+            self.save_game.close()
+        except OSError as e:
+            print(f"Could not save the game: {e}")
+        self.image_executor.shutdown(wait=False)
+        self.root.destroy()
 
     def load_images(self):
-        """Load all game images with modern styling"""
-        print("Loading room backgrounds...")
-        # Load room backgrounds
-        for room, path in ROOM_BACKGROUNDS.items():
-            print(f"Loading room background for {room} from {path}")
-            self.room_images[room] = load_image(path, (400, 300))
-            if self.room_images[room] is None:
-                print(f"Failed to load room background for {room}")
-
-        print("Loading item icons...")
-        # Load item icons
+        """
+        Load game images in a thread pool, current room background first.
+
+        Only the current room's background is waited for; item icons finish
+        in the background and other rooms load on first visit. Decoding and
+        resizing run in worker threads, and only the PhotoImage creation
+        happens on the Tk thread.
+        """
+        self.request_room_image(self.engine.current_room)
         for item, path in ITEM_ICONS.items():
-            print(f"Loading item icon for {item} from {path}")
-            self.item_images[item] = load_image(path, (32, 32))
-            if self.item_images[item] is None:
-                print(f"Failed to load item icon for {item}")
+            self.pending_images[('item', item)] = self.image_executor.submit(prepare_image, path, (32, 32))
+
+        first_room = ('room', self.engine.current_room)
+        if first_room in self.pending_images:
+            self.finish_image_load(first_room, self.pending_images.pop(first_room))
+
+    def request_room_image(self, room):
+        """Start loading a room background unless it is loaded or already on its way"""
+        if room in self.room_images or ('room', room) in self.pending_images:
+            return
+        background = self.game_data.room_background(room, ROOM_BACKGROUNDS.get(room))
+        if background is None:
+            return
+        self.pending_images[('room', room)] = self.image_executor.submit(
+            prepare_image, background, (400, 300))
+        self.schedule_image_poll()
+
+    def schedule_image_poll(self):
+        if self.image_poll_job is None and self.pending_images:
+            self.image_poll_job = self.root.after(IMAGE_POLL_MS, self.poll_image_loads)
+
+    def poll_image_loads(self):
+        """Turn finished background loads into PhotoImages and redraw what uses them"""
+        self.image_poll_job = None
+        done = [key for key, future in self.pending_images.items() if future.done()]
+        for key in done:
+            self.finish_image_load(key, self.pending_images.pop(key))
+
+        if ('room', self.engine.current_room) in done or any(kind == 'item' for kind, name in done):
+            self.update_room_display()
+        if any(kind == 'item' for kind, name in done):
+            self.update_inventory_display()
+        self.schedule_image_poll()
+
+    def finish_image_load(self, key, future):
+        kind, name = key
+        try:
+            image = ImageTk.PhotoImage(future.result())
+        except Exception as e:
+            print(f"Failed to load {kind} image for {name}: {e}")
+            image = None
+        if kind == 'room':
+            self.room_images[name] = image
+        else:
+            self.item_images[name] = image
 
     def create_styles(self):
         """Create modern styles with enhanced visual effects"""
@@ -122,6 +433,9 @@ class CryptoQuestGUI:
                        foreground=COLORS['accent'],
                        font=('Helvetica', 10, 'bold'))
         
+        # Monospace labels for the cipher alphabet references
+        style.configure('Mono.TLabel', font=('Courier', 12))
+
         # Progress bar style
         style.configure('TProgressbar',
                        background=COLORS['accent'],
@@ -149,6 +463,8 @@ class CryptoQuestGUI:
         # Room background with overlay and items
         self.room_canvas = tk.Canvas(self.room_frame, bg=COLORS['background'])
         self.room_canvas.pack(fill=tk.BOTH, expand=True)
+        self.room_scene = RoomScene(self.room_canvas, self.on_item_hover,
+                                    self.on_item_leave, self.take_item)
         
         # Room description with modern font
         self.room_text = scrolledtext.ScrolledText(self.room_frame, 
@@ -194,6 +510,10 @@ class CryptoQuestGUI:
         self.inventory_canvas.create_window((0, 0), 
                                           window=self.inventory_items_frame,
                                           anchor="nw")
+        self.inventory_panel = InventoryPanel(self.inventory_items_frame,
+                                              self.inventory_canvas,
+                                              self.game_data.ITEMS,
+                                              self.use_item)
 
     def create_puzzle_view(self):
         # Puzzle frame with modern styling
@@ -239,7 +559,7 @@ class CryptoQuestGUI:
         
         # Score display
         self.score_label = ttk.Label(self.status_frame,
-                                   text=f"Score: {self.score}",
+                                   text=f"Score: {self.engine.score}",
                                    style='TLabel')
         self.score_label.pack(side=tk.LEFT, padx=5)
         
@@ -251,14 +571,12 @@ class CryptoQuestGUI:
 
     def update_room_display(self):
         """Update the room display with current items and description"""
-        room = self.game_data.ROOMS[self.current_room]
+        room = self.game_data.ROOMS[self.engine.current_room]
         
-        # Update room background
-        if self.current_room in self.room_images:
-            self.room_canvas.delete("all")
-            self.room_canvas.create_image(0, 0,
-                                        image=self.room_images[self.current_room],
-                                        anchor="nw")
+        # Update room background, loading it first if this room is new
+        self.room_scene.set_background(self.room_images.get(self.engine.current_room))
+        if self.engine.current_room not in self.room_images:
+            self.request_room_image(self.engine.current_room)
         
         # Update room description
         self.room_text.configure(state='normal')
@@ -269,8 +587,9 @@ class CryptoQuestGUI:
         if room['puzzles']:
             self.room_text.insert(tk.END, "\nAvailable puzzles:\n", "subtitle")
             for puzzle in room['puzzles']:
-                if puzzle not in self.solved_puzzles:
-                    difficulty = PUZZLE_DIFFICULTIES.get(puzzle, 'medium')
+                if puzzle not in self.engine.solved_puzzles:
+                    difficulty = self.game_data.puzzle_difficulty(
+                        puzzle, PUZZLE_DIFFICULTIES.get(puzzle, 'medium'))
                     self.room_text.insert(tk.END,
                                         f"• {puzzle} ({difficulty.upper()})\n",
                                         f"difficulty_{difficulty}")
@@ -278,87 +597,11 @@ class CryptoQuestGUI:
         self.room_text.configure(state='disabled')
         
         # Place items on the room canvas
-        self.place_items_on_canvas(room['items'])
+        self.place_items_on_canvas(self.engine.room_items())
 
     def place_items_on_canvas(self, items):
         """Place items on the room canvas with clickable functionality"""
-        if not items:
-            return
-            
-        # Calculate positions for items
-        canvas_width = self.room_canvas.winfo_width()
-        canvas_height = self.room_canvas.winfo_height()
-        
-        # Center items in the middle of the canvas
-        center_x = canvas_width // 2
-        center_y = canvas_height // 2
-        
-        # If there's only one item, place it in the center
-        if len(items) == 1:
-            item = items[0]
-            item_frame = ttk.Frame(self.room_canvas, style='TFrame')
-            item_frame.bind('<Enter>', lambda e, i=item: self.on_item_hover(e, i))
-            item_frame.bind('<Leave>', lambda e: self.on_item_leave(e))
-            item_frame.bind('<Button-1>', lambda e, i=item: self.take_item(i))
-            
-            if item in self.item_images:
-                item_image = self.item_images[item]
-                icon_label = ttk.Label(item_frame,
-                                     image=item_image,
-                                     style='TLabel')
-                icon_label.image = item_image
-                icon_label.pack(pady=5)
-            
-            name_label = ttk.Label(item_frame,
-                                 text=item,
-                                 style='TLabel')
-            name_label.pack(pady=5)
-            
-            # Ensure the item stays within bounds
-            x = max(50, min(center_x, canvas_width - 50))
-            y = max(50, min(center_y, canvas_height - 50))
-            
-            self.room_canvas.create_window(x, y,
-                                         window=item_frame,
-                                         anchor="center",
-                                         tags=("item", item))
-        else:
-            # For multiple items, arrange them in a circle around the center
-            # Use a smaller radius to ensure items stay within bounds
-            radius = min(canvas_width, canvas_height) // 4
-            angle_step = 360 / len(items)
-            
-            for i, item in enumerate(items):
-                angle = math.radians(i * angle_step)
-                x = center_x + radius * math.cos(angle)
-                y = center_y + radius * math.sin(angle)
-                
-                # Ensure the item stays within bounds
-                x = max(50, min(x, canvas_width - 50))
-                y = max(50, min(y, canvas_height - 50))
-                
-                item_frame = ttk.Frame(self.room_canvas, style='TFrame')
-                item_frame.bind('<Enter>', lambda e, i=item: self.on_item_hover(e, i))
-                item_frame.bind('<Leave>', lambda e: self.on_item_leave(e))
-                item_frame.bind('<Button-1>', lambda e, i=item: self.take_item(i))
-                
-                if item in self.item_images:
-                    item_image = self.item_images[item]
-                    icon_label = ttk.Label(item_frame,
-                                         image=item_image,
-                                         style='TLabel')
-                    icon_label.image = item_image
-                    icon_label.pack(pady=5)
-                
-                name_label = ttk.Label(item_frame,
-                                     text=item,
-                                     style='TLabel')
-                name_label.pack(pady=5)
-                
-                self.room_canvas.create_window(x, y,
-                                             window=item_frame,
-                                             anchor="center",
-                                             tags=("item", item))
+        self.room_scene.show(items, self.item_images)
 
     def on_item_hover(self, event, item):
         """Handle item hover effect with enhanced visual feedback"""
@@ -390,9 +633,7 @@ class CryptoQuestGUI:
 
     def take_item(self, item):
         """Take an item from the room"""
-        if item in self.game_data.ROOMS[self.current_room]['items']:
-            self.inventory.append(item)
-            self.game_data.ROOMS[self.current_room]['items'].remove(item)
+        if self.engine.take_item(item):
             self.update_room_display()
             self.update_inventory_display()
             self.status_var.set(f"Took {item}")
@@ -404,54 +645,19 @@ class CryptoQuestGUI:
             self.status_var.set("Item not found")
 
     def update_inventory_display(self):
-        # Clear existing items
-        for widget in self.inventory_items_frame.winfo_children():
-            widget.destroy()
-        
-        if not self.inventory:
-            ttk.Label(self.inventory_items_frame,
-                     text="Your inventory is empty.",
-                     style='TLabel').pack(pady=5)
-        else:
-            for item in self.inventory:
-                item_frame = ttk.Frame(self.inventory_items_frame, style='TFrame')
-                item_frame.pack(fill=tk.X, pady=2)
-                
-                if item in self.item_images:
-                    icon_label = ttk.Label(item_frame,
-                                         image=self.item_images[item],
-                                         style='TLabel')
-                    icon_label.image = self.item_images[item]
-                    icon_label.pack(side=tk.LEFT, padx=5)
-                
-                ttk.Label(item_frame,
-                         text=f"{item}: {self.game_data.ITEMS[item]['description']}",
-                         style='TLabel').pack(side=tk.LEFT)
-                
-                # Add use button
-                use_button = ModernButton(item_frame,
-                                        text="Use",
-                                        command=lambda i=item: self.use_item(i))
-                use_button.pack(side=tk.RIGHT, padx=5)
-        
-        self.inventory_items_frame.update_idletasks()
-        self.inventory_canvas.configure(scrollregion=self.inventory_canvas.bbox("all"))
+        self.inventory_panel.show(self.engine.inventory, self.item_images)
 
     def solve_current_puzzle(self):
         """Solve the current puzzle in the room"""
         # Get current puzzle
-        room = self.game_data.ROOMS[self.current_room]
+        room = self.game_data.ROOMS[self.engine.current_room]
         if not room['puzzles']:
             messagebox.showinfo("No Puzzle",
                               "There are no puzzles in this room.")
             return
         
         # Find first unsolved puzzle
-        current_puzzle_name = None
-        for puzzle in room['puzzles']:
-            if puzzle not in self.solved_puzzles:
-                current_puzzle_name = puzzle
-                break
+        current_puzzle_name = self.engine.current_puzzle()
         
         if current_puzzle_name:
             self.solve_puzzle(current_puzzle_name)
@@ -477,9 +683,8 @@ class CryptoQuestGUI:
         result = dialog.show()
         
         if result:
-            self.solved_puzzles.add(puzzle_name)
+            self.engine.mark_solved(puzzle_name)
             if puzzle_data['reward']:
-                self.inventory.append(puzzle_data['reward'])
                 messagebox.showinfo("Success!",
                                   f"You solved the puzzle and received: {puzzle_data['reward']}")
             self.update_progress()
@@ -487,24 +692,47 @@ class CryptoQuestGUI:
             self.check_achievements()
 
     def create_puzzle_interface(self, puzzle):
-        # Clear previous puzzle interface
-        for widget in self.puzzle_canvas.winfo_children():
-            widget.destroy()
-        
-        # Create puzzle-specific interface based on type
-        if puzzle['type'] == 'caesar':
-            self.create_caesar_interface(puzzle)
-        elif puzzle['type'] == 'vigenere':
-            self.create_vigenere_interface(puzzle)
-        elif puzzle['type'] == 'morse':
-            self.create_morse_interface(puzzle)
-        elif puzzle['type'] == 'binary':
-            self.create_binary_interface(puzzle)
-
-    def create_caesar_interface(self, puzzle):
+        """
+        Show the panel for the puzzle's type, bound to this puzzle.
+
+        Each panel is built the first time its type is needed and kept in
+        puzzle_panels; switching puzzles only hides the old panel and
+        rebinds the texts and controls of the cached one.
+        """
+        builders = {
+            'caesar': (self.create_caesar_interface, self.bind_caesar_interface),
+            'vigenere': (self.create_vigenere_interface, self.bind_vigenere_interface),
+            'morse': (self.create_morse_interface, self.bind_decode_interface),
+            'binary': (self.create_binary_interface, self.bind_decode_interface),
+        }
+        # A preview still pending for the old puzzle must not write into the new panel
+        self.cancel_vigenere_preview()
+        if puzzle['type'] not in builders:
+            # Clear the area rather than leave the last puzzle's panel usable
+            if self.current_panel is not None:
+                self.current_panel['frame'].pack_forget()
+                self.current_panel = None
+            self.current_puzzle = None
+            return
+        create, bind = builders[puzzle['type']]
+
+        panel = self.puzzle_panels.get(puzzle['type'])
+        if panel is None:
+            panel = self.puzzle_panels[puzzle['type']] = create()
+        if self.current_panel is not panel:
+            if self.current_panel is not None:
+                self.current_panel['frame'].pack_forget()
+            panel['frame'].pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+            self.current_panel = panel
+
+        self.current_puzzle = puzzle
+        self.preview_label = panel['preview']
+        self.preview_label.configure(text="", foreground=COLORS['text'])
+        bind(panel, puzzle)
+
+    def create_caesar_interface(self):
         """Create Caesar cipher interface with hardcoded answers and alphabet reference"""
         frame = ttk.Frame(self.puzzle_canvas, style='TFrame')
-        frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Title
         ttk.Label(frame,
@@ -515,15 +743,11 @@ class CryptoQuestGUI:
         alphabet_frame = ttk.Frame(frame, style='TFrame')
         alphabet_frame.pack(pady=5)
         
-        # Original alphabet
-        style = ttk.Style()
-        style.configure('Mono.TLabel', font=('Courier', 12))  # Use Courier or another monospace font
-
-    # Original and shifted alphabets
+        # Original and shifted alphabets
         original = "A B C D E F G H I J K L M N O P Q R S T U V W X Y Z"
         shifted = "D E F G H I J K L M N O P Q R S T U V W X Y Z A B C"
 
-    # Create labels with monospace font
+        # Create labels with monospace font
         ttk.Label(alphabet_frame,
               text=f"Original: {original}",
               style='Mono.TLabel').pack()
@@ -535,9 +759,10 @@ class CryptoQuestGUI:
         ttk.Label(frame,
                  text="Encrypted Text:",
                  style='TLabel').pack(pady=5)
-        ttk.Label(frame,
-                 text=puzzle['encrypted_text'],
-                 style='TLabel').pack(pady=5)
+        encrypted_label = ttk.Label(frame,
+                                  text="",
+                                  style='TLabel')
+        encrypted_label.pack(pady=5)
         
         # Shift controls
         shift_frame = ttk.Frame(frame, style='TFrame')
@@ -553,34 +778,25 @@ class CryptoQuestGUI:
                               to=3,  # Only goes up to 3 since that's our solution
                               variable=self.shift_var,
                               orient=tk.HORIZONTAL,
-                              command=lambda v: self.update_caesar_preview(puzzle['encrypted_text'], int(float(v))))
+                              command=lambda v: self.update_caesar_preview(
+                                  self.current_puzzle['encrypted_text'], int(float(v))))
         shift_scale.pack(side=tk.LEFT, padx=5)
         
         # Preview text with larger font
-        self.preview_label = ttk.Label(frame,
-                                     text="",
-                                     style='TLabel',
-                                     font=('Helvetica', 14, 'bold'))
-        self.preview_label.pack(pady=10)
+        preview_label = ttk.Label(frame,
+                                text="",
+                                style='TLabel',
+                                font=('Helvetica', 14, 'bold'))
+        preview_label.pack(pady=10)
         
         # Character-by-character preview
-        self.char_preview_frame = ttk.Frame(frame, style='TFrame')
-        self.char_preview_frame.pack(pady=5)
-        
-        # Initialize character labels
-        self.char_labels = []
-        for i in range(len(puzzle['encrypted_text'])):
-            label = ttk.Label(self.char_preview_frame,
-                            text="",
-                            style='TLabel',
-                            font=('Helvetica', 12))
-            label.pack(side=tk.LEFT, padx=2)
-            self.char_labels.append(label)
+        self.char_preview = CharPreview(frame)
+        self.char_preview.pack(pady=5)
         
         # Hint button
         ttk.Button(frame,
                   text="Show Hint",
-                  command=lambda: self.show_puzzle_hint(puzzle)).pack(pady=5)
+                  command=lambda: self.show_puzzle_hint(self.current_puzzle)).pack(pady=5)
         
         # Educational information
         ttk.Label(frame,
@@ -593,25 +809,23 @@ class CryptoQuestGUI:
                       "Move the slider to see the decryption in action.",
                  style='TLabel',
                  wraplength=300).pack(pady=5)
-        
-        # Initialize with the encrypted text
-        for i, char in enumerate(puzzle['encrypted_text']):
-            self.char_labels[i].configure(text=char)
+
+        return {'frame': frame, 'encrypted': encrypted_label, 'preview': preview_label}
+
+    def bind_caesar_interface(self, panel, puzzle):
+        text = puzzle['encrypted_text']
+        panel['encrypted'].configure(text=text)
+        self.shift_var.set(0)
+
+        self.char_preview.show(text)
 
     def update_caesar_preview(self, text, shift):
         """Update Caesar cipher preview with correct shifts"""
         # Calculate the decrypted text based on the shift
-        decrypted = self.crypto_tools.caesar_cipher(text, -shift)
+        decrypted = self.preview_cache.get('caesar', text, -shift)
         
-        # Update each character individually
-        for i, char in enumerate(decrypted):
-            self.char_labels[i].configure(text=char)
-            
-            # Color the character when it's in the correct position
-            if shift == 3:  # At shift 3, all characters are correct
-                self.char_labels[i].configure(foreground=COLORS['success'])
-            else:
-                self.char_labels[i].configure(foreground=COLORS['text'])
+        # Update the changed characters, coloured when correct
+        self.char_preview.show(decrypted, highlight=shift == 3)  # At shift 3, all characters are correct
         
         # Update the full preview
         self.preview_label.configure(text=decrypted)
@@ -622,10 +836,9 @@ class CryptoQuestGUI:
         else:
             self.preview_label.configure(foreground=COLORS['text'])
 
-    def create_vigenere_interface(self, puzzle):
+    def create_vigenere_interface(self):
         """Create Vigenère cipher interface"""
         frame = ttk.Frame(self.puzzle_canvas, style='TFrame')
-        frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Title
         ttk.Label(frame,
@@ -636,9 +849,10 @@ class CryptoQuestGUI:
         ttk.Label(frame,
                  text="Encrypted Text:",
                  style='TLabel').pack(pady=5)
-        ttk.Label(frame,
-                 text=puzzle['encrypted_text'],
-                 style='TLabel').pack(pady=5)
+        encrypted_label = ttk.Label(frame,
+                                  text="",
+                                  style='TLabel')
+        encrypted_label.pack(pady=5)
         
         # Key entry
         key_frame = ttk.Frame(frame, style='TFrame')
@@ -651,110 +865,104 @@ class CryptoQuestGUI:
                  textvariable=self.key_var).pack(side=tk.LEFT, padx=5)
         
         # Preview text
-        self.preview_label = ttk.Label(frame,
-                                     text="",
-                                     style='TLabel')
-        self.preview_label.pack(pady=5)
+        preview_label = ttk.Label(frame,
+                                text="",
+                                style='TLabel')
+        preview_label.pack(pady=5)
         
         # Update preview when key changes
-        self.key_var.trace_add('write', lambda *args: self.update_vigenere_preview(puzzle['encrypted_text']))
+        self.key_var.trace_add('write', lambda *args: self.schedule_vigenere_preview())
+
+        return {'frame': frame, 'encrypted': encrypted_label, 'preview': preview_label}
 
-    def update_vigenere_preview(self, text):
+    def bind_vigenere_interface(self, panel, puzzle):
+        panel['encrypted'].configure(text=puzzle['encrypted_text'])
+        self.vigenere_preview = VigenerePreview(puzzle['encrypted_text'], cache=self.preview_cache)
+        self.key_var.set("")
+
+    def cancel_vigenere_preview(self):
+        if self.vigenere_preview_job is not None:
+            self.root.after_cancel(self.vigenere_preview_job)
+            self.vigenere_preview_job = None
+
+    def schedule_vigenere_preview(self):
+        """Coalesce a burst of keystrokes into one preview update"""
+        if self.vigenere_preview_job is not None:
+            self.root.after_cancel(self.vigenere_preview_job)
+        self.vigenere_preview_job = self.root.after(VIGENERE_PREVIEW_DELAY_MS,
+                                                    self.update_vigenere_preview)
+
+    def update_vigenere_preview(self):
         """Update Vigenère cipher preview"""
+        self.vigenere_preview_job = None
         key = self.key_var.get()
         if key:
-            decrypted = self.crypto_tools.vigenere_cipher(text, key, decrypt=True)
+            decrypted = self.vigenere_preview.update(key)
             self.preview_label.configure(text=decrypted)
 
-    def create_morse_interface(self, puzzle):
-        """Create Morse code interface"""
+    def create_decode_interface(self, title, label, decode):
+        """Create the shared layout of the Morse and binary panels"""
         frame = ttk.Frame(self.puzzle_canvas, style='TFrame')
-        frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Title
         ttk.Label(frame,
-                 text="Morse Code",
+                 text=title,
                  style='TLabel').pack(pady=5)
         
         # Encrypted text
         ttk.Label(frame,
-                 text="Morse Code:",
-                 style='TLabel').pack(pady=5)
-        ttk.Label(frame,
-                 text=puzzle['encrypted_text'],
+                 text=label,
                  style='TLabel').pack(pady=5)
+        encrypted_label = ttk.Label(frame,
+                                  text="",
+                                  style='TLabel')
+        encrypted_label.pack(pady=5)
         
         # Preview text
-        self.preview_label = ttk.Label(frame,
-                                     text="",
-                                     style='TLabel')
-        self.preview_label.pack(pady=5)
+        preview_label = ttk.Label(frame,
+                                text="",
+                                style='TLabel')
+        preview_label.pack(pady=5)
         
         # Decode button
         ttk.Button(frame,
                   text="Decode",
-                  command=lambda: self.update_morse_preview(puzzle['encrypted_text'])).pack(pady=5)
+                  command=lambda: decode(self.current_puzzle['encrypted_text'])).pack(pady=5)
+
+        return {'frame': frame, 'encrypted': encrypted_label, 'preview': preview_label}
+
+    def bind_decode_interface(self, panel, puzzle):
+        panel['encrypted'].configure(text=puzzle['encrypted_text'])
+
+    def create_morse_interface(self):
+        """Create Morse code interface"""
+        return self.create_decode_interface("Morse Code", "Morse Code:", self.update_morse_preview)
 
     def update_morse_preview(self, text):
         """Update Morse code preview"""
         try:
-            decrypted = self.crypto_tools.morse_to_text(text)
+            decrypted = self.preview_cache.get('morse', text, decrypt=True)
             self.preview_label.configure(text=decrypted)
         except Exception as e:
             self.preview_label.configure(text=f"Error: {str(e)}")
 
-    def create_binary_interface(self, puzzle):
+    def create_binary_interface(self):
         """Create binary code interface"""
-        frame = ttk.Frame(self.puzzle_canvas, style='TFrame')
-        frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Title
-        ttk.Label(frame,
-                 text="Binary Code",
-                 style='TLabel').pack(pady=5)
-        
-        # Encrypted text
-        ttk.Label(frame,
-                 text="Binary:",
-                 style='TLabel').pack(pady=5)
-        ttk.Label(frame,
-                 text=puzzle['encrypted_text'],
-                 style='TLabel').pack(pady=5)
-        
-        # Preview text
-        self.preview_label = ttk.Label(frame,
-                                     text="",
-                                     style='TLabel')
-        self.preview_label.pack(pady=5)
-        
-        # Decode button
-        ttk.Button(frame,
-                  text="Decode",
-                  command=lambda: self.update_binary_preview(puzzle['encrypted_text'])).pack(pady=5)
+        return self.create_decode_interface("Binary Code", "Binary:", self.update_binary_preview)
 
     def update_binary_preview(self, text):
         """Update binary code preview"""
         try:
-            decrypted = self.crypto_tools.binary_to_text(text)
+            decrypted = self.preview_cache.get('binary', text, decrypt=True)
             self.preview_label.configure(text=decrypted)
         except Exception as e:
             self.preview_label.configure(text=f"Error: {str(e)}")
 
     def check_achievements(self):
         # Check and award achievements
-        achievements = {
-            'first_puzzle': len(self.solved_puzzles) >= 1,
-            'half_way': len(self.solved_puzzles) >= len(self.game_data.PUZZLES) // 2,
-            'master_cryptographer': len(self.solved_puzzles) == len(self.game_data.PUZZLES),
-            'treasure_hunter': 'treasure' in self.inventory
-        }
-        
-        for achievement, condition in achievements.items():
-            if condition and achievement not in self.achievements:
-                self.achievements.add(achievement)
-                self.show_achievement(achievement)
-                self.score += 100
-                self.update_score()
+        for achievement in self.engine.check_achievements():
+            self.show_achievement(achievement)
+            self.update_score()
 
     def show_achievement(self, achievement):
         # Show achievement popup with animation
@@ -762,50 +970,34 @@ class CryptoQuestGUI:
                           f"You unlocked the '{achievement}' achievement!")
 
     def update_score(self):
-        self.score_label.configure(text=f"Score: {self.score}")
-        self.achievement_label.configure(text=f"Achievements: {len(self.achievements)}")
+        self.score_label.configure(text=f"Score: {self.engine.score}")
+        self.achievement_label.configure(text=f"Achievements: {len(self.engine.achievements)}")
 
     def update_progress(self):
-        total_puzzles = len(self.game_data.PUZZLES)
-        solved_puzzles = len(self.solved_puzzles)
-        self.progress = (solved_puzzles / total_puzzles) * 100
-        self.progress_bar['value'] = self.progress
+        self.progress_bar['value'] = self.engine.progress
 
     def previous_room(self):
-        current_index = list(self.game_data.ROOMS.keys()).index(self.current_room)
-        if current_index > 0:
-            self.current_room = list(self.game_data.ROOMS.keys())[current_index - 1]
+        if self.engine.previous_room():
             self.update_room_display()
 
     def next_room(self):
-        current_index = list(self.game_data.ROOMS.keys()).index(self.current_room)
-        if current_index < len(self.game_data.ROOMS) - 1:
-            self.current_room = list(self.game_data.ROOMS.keys())[current_index + 1]
+        if self.engine.next_room():
             self.update_room_display()
 
     def use_item(self, item):
         """Use an item with educational information"""
-        if item in self.inventory:
-            if self.game_data.ITEMS[item]['usable']:
-                # Show educational information
-                educational_info = self.game_data.ITEMS[item]['educational_info']
-                messagebox.showinfo(f"Educational Information - {item}", educational_info)
-                
-                # Get current puzzle
-                room = self.game_data.ROOMS[self.current_room]
-                current_puzzle = None
-                for puzzle in room['puzzles']:
-                    if puzzle not in self.solved_puzzles:
-                        current_puzzle = puzzle
-                        break
-                
-                if current_puzzle:
-                    puzzle = self.game_data.PUZZLES[current_puzzle]
-                    self.status_var.set(f"Used {item} - Check the educational information!")
-                else:
-                    self.status_var.set(f"No active puzzle to use {item} on")
+        outcome = self.engine.use_item(item)
+        if outcome in ('used', 'no_puzzle'):
+            # Show educational information
+            educational_info = self.game_data.ITEMS[item]['educational_info']
+            messagebox.showinfo(f"Educational Information - {item}", educational_info)
+            
+            if outcome == 'used':
+                self.status_var.set(f"Used {item} - Check the educational information!")
             else:
-                self.status_var.set(f"Can't use {item}")
+                self.status_var.set(f"No active puzzle to use {item} on")
+        elif outcome == 'unusable':
+            self.status_var.set(f"Can't use {item}")
         else:
             self.status_var.set("Item not in inventory")
 
@@ -912,7 +1104,7 @@ class PuzzleDialog:
         return self.result
     
     def check_solution(self, dialog, solution):
-        if solution.upper() == self.puzzle['solution']:
+        if GameEngine.check_answer(self.puzzle, solution):
             self.result = True
             dialog.destroy()
         else:
@@ -922,4 +1114,8 @@ class PuzzleDialog:
 if __name__ == "__main__":
     root = tk.Tk()
     app = CryptoQuestGUI(root)
-    root.mainloop()
\ No newline at end of file
+    try:
+        root.mainloop()
+    finally:
+        # Also save when the loop ends without the window being closed, e.g. on Ctrl+C
+        app.save_game.close()
\ No newline at end of file
@@ -0,0 +1,123 @@
+import argparse
+import asyncio
+import json
+import time
+
+from crypto_tools import CryptoTools
+from game_server import DEFAULT_HOST, DEFAULT_PORT
+
+
+class LoadStats:
+    def __init__(self):
+        self.commands = 0
+        self.playthroughs = 0
+        self.elapsed = 0.0
+        self.latencies = []
+
+    def percentile(self, fraction):
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Player:
+    """A scripted client connection that plays the game over the protocol"""
+
+    def __init__(self, reader, writer, stats):
+        self.reader = reader
+        self.writer = writer
+        self.stats = stats
+
+    async def send(self, command):
+        start = time.perf_counter()
+        self.writer.write(command.encode('utf-8') + b'\n')
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection")
+        self.stats.latencies.append(time.perf_counter() - start)
+        self.stats.commands += 1
+        return json.loads(line)
+
+    def answers(self, puzzle):
+        """Candidate answers for a puzzle; Vigenère puzzles are skipped"""
+        text = puzzle['encrypted_text']
+        if puzzle['type'] == 'caesar':
+            return [CryptoTools.caesar_cipher(text, shift, decrypt=True) for shift in range(1, 26)]
+        if puzzle['type'] == 'morse':
+            return [CryptoTools.morse_code(text, decrypt=True)]
+        if puzzle['type'] == 'binary':
+            return [CryptoTools.binary_to_text(text)]
+        return []
+
+    async def play(self):
+        """Take every item, solve every puzzle and walk to the last room, then restart"""
+        room = await self.send('look')
+        while True:
+            for item in room['items']:
+                await self.send(f'take {item}')
+            await self.send('inventory')
+            for name in room['puzzles']:
+                puzzle = await self.send(f'solve {name}')
+                for answer in self.answers(puzzle):
+                    if (await self.send(f'solve {name} {answer}'))['ok']:
+                        break
+            room = await self.send('next')
+            if not room['ok']:
+                self.stats.playthroughs += 1
+                room = await self.send('restart')
+
+
+async def _connect(host, port, stats):
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 20)
+    welcome = json.loads(await reader.readline())
+    if not welcome.get('ok'):
+        raise ConnectionError("Unexpected greeting from server")
+    return Player(reader, writer, stats)
+
+
+async def run_load(host=DEFAULT_HOST, port=DEFAULT_PORT, sessions=100, active=None,
+                   duration=10.0, connect_batch=500):
+    """
+    Open `sessions` connections, keep them all open and let `active` of
+    them (all by default) play scripted games for `duration` seconds.
+    Returns the LoadStats.
+    """
+    stats = LoadStats()
+    players = []
+    for start in range(0, sessions, connect_batch):
+        batch = [_connect(host, port, stats) for _ in range(start, min(sessions, start + connect_batch))]
+        players.extend(await asyncio.gather(*batch))
+    connected = time.perf_counter()
+
+    active = sessions if active is None else min(active, sessions)
+    tasks = [asyncio.ensure_future(player.play()) for player in players[:active]]
+    await asyncio.sleep(duration)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    stats.elapsed = time.perf_counter() - connected
+
+    for player in players:
+        player.writer.close()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the Crypto Quest game server")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--sessions', type=int, default=100, help="connections to open")
+    parser.add_argument('--active', type=int, help="connections that send commands (default: all)")
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds to run")
+    args = parser.parse_args()
+
+    stats = asyncio.run(run_load(args.host, args.port, args.sessions, args.active, args.duration))
+    print(f"{args.sessions} sessions, {stats.commands:,} commands in {stats.elapsed:.1f}s "
+          f"({stats.commands / stats.elapsed:,.0f}/s), {stats.playthroughs:,} playthroughs")
+    print(f"latency p50 {stats.percentile(0.5) * 1000:.2f} ms, "
+          f"p99 {stats.percentile(0.99) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import re
+
+# International Morse code, with ' ' standing for the gap between words
+MORSE_CODE = {
+    'A': '.-', 'B': '-...', 'C': '-.-.', 'D': '-..', 'E': '.', 'F': '..-.',
+    'G': '--.', 'H': '....', 'I': '..', 'J': '.---', 'K': '-.-', 'L': '.-..',
+    'M': '--', 'N': '-.', 'O': '---', 'P': '.--.', 'Q': '--.-', 'R': '.-.',
+    'S': '...', 'T': '-', 'U': '..-', 'V': '...-', 'W': '.--', 'X': '-..-',
+    'Y': '-.--', 'Z': '--..',
+    '0': '-----', '1': '.----', '2': '..---', '3': '...--', '4': '....-',
+    '5': '.....', '6': '-....', '7': '--...', '8': '---..', '9': '----.',
+    '.': '.-.-.-', ',': '--..--', '?': '..--..', "'": '.----.', '!': '-.-.--',
+    '/': '-..-.', '(': '-.--.', ')': '-.--.-', '&': '.-...', ':': '---...',
+    ';': '-.-.-.', '=': '-...-', '+': '.-.-.', '-': '-....-', '_': '..--.-',
+    '"': '.-..-.', '$': '...-..-', '@': '.--.-.',
+    ' ': ' '
+}
+
+REVERSE_MORSE = {code: char for char, code in MORSE_CODE.items() if char != ' '}
+
+
+class _DecodeTable(dict):
+    """Code to character lookup where unknown codes decode to nothing"""
+
+    def __missing__(self, code):
+        return ''
+
+
+# '/' is the token that word gaps are normalised to before decoding
+_DECODE_TABLE = _DecodeTable(REVERSE_MORSE)
+_DECODE_TABLE['/'] = ' '
+
+
+class _EncodeTable(dict):
+    """
+    str.translate table that maps every character to its code plus the
+    separating space; unknown characters become an empty code.
+    """
+
+    def __missing__(self, code):
+        return ' '
+
+
+_ENCODE_TABLE = _EncodeTable()
+for _char, _code in MORSE_CODE.items():
+    _ENCODE_TABLE[ord(_char)] = _code + ' '
+    _ENCODE_TABLE[ord(_char.lower())] = _code + ' '
+
+# Binary trie in heap layout: the root is node 0, a dot from node n leads to
+# 2n + 1 and a dash to 2n + 2. _TRIE[node] is the character spelled by the
+# path to that node, or '' if there is none.
+_TRIE_DEPTH = max(len(code) for code in REVERSE_MORSE)
+_TRIE = [''] * (2 ** (_TRIE_DEPTH + 1) - 1)
+for _code, _char in REVERSE_MORSE.items():
+    _node = 0
+    for _symbol in _code:
+        _node = 2 * _node + (1 if _symbol == '.' else 2)
+    _TRIE[_node] = _char
+_INVALID_NODE = -1
+
+# A word gap is a slash or two or more spaces between letters
+_WORD_GAP = re.compile(r'(?:\s*/\s*|\s{2,})+')
+
+
+def encode(text):
+    """Convert text to Morse code, letters separated by spaces and words by three spaces"""
+    return text.translate(_ENCODE_TABLE)[:-1]
+
+
+def decode(code):
+    """Convert Morse code to text; unknown codes are dropped"""
+    tokens = _WORD_GAP.sub(' / ', code.strip(' \t\r\n/')).split()
+    return ''.join(map(_DECODE_TABLE.__getitem__, tokens))
+
+
+def encode_many(texts):
+    """Convert many texts to Morse code"""
+    return [text.translate(_ENCODE_TABLE)[:-1] for text in texts]
+
+
+def decode_many(codes):
+    """Convert many Morse code strings to text"""
+    return [decode(code) for code in codes]
+
+
+class MorseDecoder:
+    """
+    Incremental Morse decoder.
+
+    Symbols are fed in any chunking and walked down the binary trie one at
+    a time; a letter is emitted when the gap after it arrives, and a word
+    space is emitted before the next letter once a word gap (a slash or two
+    or more spaces) has been seen.
+    """
+
+    def __init__(self):
+        self._node = 0
+        self._spaces = 0
+        self._word_gap = False
+        self._started = False
+
+    def feed(self, symbols):
+        """Consume a chunk of dots, dashes and gaps and return the text decoded so far"""
+        output = []
+        node = self._node
+        trie_size = len(_TRIE)
+        for symbol in symbols:
+            if symbol == '.' or symbol == '-':
+                if node != _INVALID_NODE:
+                    node = 2 * node + (1 if symbol == '.' else 2)
+                    if node >= trie_size:
+                        node = _INVALID_NODE
+                continue
+
+            if node != 0:
+                self._emit(output, node)
+                node = 0
+                self._spaces = 0
+            if symbol == '/':
+                self._word_gap = self._started
+            elif symbol.isspace():
+                self._spaces += 1
+                if self._spaces >= 2:
+                    self._word_gap = self._started
+        self._node = node
+        return ''.join(output)
+
+    def close(self):
+        """Finish the stream and return the last pending letter"""
+        output = []
+        if self._node != 0:
+            self._emit(output, self._node)
+        self._node = 0
+        return ''.join(output)
+
+    def _emit(self, output, node):
+        char = _TRIE[node] if node != _INVALID_NODE else ''
+        if not char:
+            return
+        if self._word_gap:
+            output.append(' ')
+            self._word_gap = False
+        output.append(char)
+        self._started = True
+
+
+def decode_stream(chunks):
+    """Decode an iterable of Morse code chunks, yielding text as it becomes available"""
+    decoder = MorseDecoder()
+    for chunk in chunks:
+        text = decoder.feed(chunk)
+        if text:
+            yield text
+    text = decoder.close()
+    if text:
+        yield text
@@ -0,0 +1,167 @@
+from collections import OrderedDict
+
+from crypto_tools import CryptoTools
+
+# Cipher name -> function(text, key, decrypt) used to fill the cache
+CIPHERS = {
+    'caesar': CryptoTools.caesar_cipher,
+    'vigenere': CryptoTools.vigenere_cipher,
+    'atbash': lambda text, key, decrypt: CryptoTools.atbash_cipher(text),
+    'morse': lambda text, key, decrypt: CryptoTools.morse_code(text, decrypt),
+    'binary': lambda text, key, decrypt: (CryptoTools.binary_to_text(text) if decrypt
+                                          else CryptoTools.text_to_binary(text)),
+}
+
+
+class CipherCache:
+    """
+    Bounded LRU cache of cipher results keyed by (cipher, text, key, decrypt).
+
+    The GUI previews ask for the same few results over and over while a
+    slider is dragged or a key is edited; repeated requests are a single
+    dictionary lookup (Python caches the hash of the text string). The
+    least recently used entry is evicted once maxsize is reached.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+
+    def __len__(self):
+        return len(self._results)
+
+    def get(self, cipher, text, key=None, decrypt=False):
+        """Return the cipher result, computing and caching it on a miss"""
+        result = self.lookup(cipher, text, key, decrypt)
+        if result is None:
+            result = CIPHERS[cipher](text, key, decrypt)
+            self.store(cipher, text, key, decrypt, result)
+        return result
+
+    def lookup(self, cipher, text, key=None, decrypt=False):
+        """Return the cached result, or None on a miss"""
+        cache_key = (cipher, text, key, decrypt)
+        try:
+            result = self._results[cache_key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._results.move_to_end(cache_key)
+        return result
+
+    def store(self, cipher, text, key, decrypt, result):
+        """Cache a result computed elsewhere, evicting the oldest entry if full"""
+        self._results[(cipher, text, key, decrypt)] = result
+        self._results.move_to_end((cipher, text, key, decrypt))
+        if len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached result and reset the counters"""
+        self._results.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        """Hit/miss counters and occupancy"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._results),
+            'maxsize': self.maxsize,
+        }
+
+
+class VigenerePreview:
+    """
+    Live Vigenère result for one text as its key is edited.
+
+    Every key position only affects its own column of the text
+    (text[j::len(key)]), so when the new key has the same length as the
+    previous one only the columns whose key character changed are
+    recomputed and spliced into the previous result. Other edits fall back
+    to a full computation. Results go through an optional CipherCache.
+    """
+
+    def __init__(self, text, decrypt=True, cache=None):
+        self.text = text
+        self.decrypt = decrypt
+        self.cache = cache
+        self.key = None
+        self.result = ''
+        self._chars = None
+
+    def update(self, key):
+        """Return the result for key, reusing the previous one where possible"""
+        if key == self.key:
+            return self.result
+
+        result = None
+        if self.cache is not None:
+            result = self.cache.lookup('vigenere', self.text, key, self.decrypt)
+
+        if result is None:
+            result = self._compute(key)
+            if self.cache is not None:
+                self.cache.store('vigenere', self.text, key, self.decrypt, result)
+        else:
+            self._chars = None
+
+        self.key = key
+        self.result = result
+        return result
+
+    def _compute(self, key):
+        old_key = self.key
+        lowered = key.lower()
+        if (old_key is None or len(old_key) != len(key)
+                or len(lowered) != len(key) or len(old_key.lower()) != len(old_key)):
+            self._chars = None
+            return CryptoTools.vigenere_cipher(self.text, key, self.decrypt)
+
+        key_length = len(key)
+        changed = [column for column, (old, new) in enumerate(zip(old_key.lower(), lowered))
+                   if old != new]
+        if self._chars is None:
+            self._chars = list(self.result)
+        for column in changed:
+            self._chars[column::key_length] = CryptoTools.vigenere_cipher(
+                self.text[column::key_length], key[column], self.decrypt)
+        return ''.join(self._chars)
+
+
+# Block size used by changed_ranges to skip over equal stretches quickly
+_COMPARE_BLOCK = 64
+
+
+def changed_ranges(old, new):
+    """
+    Half-open (start, end) ranges where two equal-length strings differ,
+    merged into runs. Returns None when the lengths differ. Equal blocks
+    are skipped with one string comparison each, so unchanged stretches
+    of a long text cost little.
+    """
+    if len(old) != len(new):
+        return None
+    ranges = []
+    start = None
+    for block in range(0, len(new), _COMPARE_BLOCK):
+        end = block + _COMPARE_BLOCK
+        if old[block:end] == new[block:end]:
+            if start is not None:
+                ranges.append((start, block))
+                start = None
+            continue
+        for index in range(block, min(end, len(new))):
+            if old[index] != new[index]:
+                if start is None:
+                    start = index
+            elif start is not None:
+                ranges.append((start, index))
+                start = None
+    if start is not None:
+        ranges.append((start, len(new)))
+    return ranges
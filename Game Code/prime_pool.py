@@ -0,0 +1,161 @@
+import json
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import rsa_tools
+
+
+class PrimePool:
+    """
+    Bounded pool of ready-made RSA primes.
+
+    Background worker processes run rsa_tools.generate_prime and the pool
+    keeps up to `size` primes of `bits` bits on hand, topping itself up
+    whenever one is taken. Taking a prime or a key pair is then only a
+    deque pop plus the key arithmetic. The pool can be saved to disk and
+    warmed from that file at startup; loading consumes the file, so a
+    prime is never handed out by two runs even if this one crashes.
+    """
+
+    def __init__(self, bits=1024, size=8, processes=None, e=rsa_tools.DEFAULT_EXPONENT, path=None):
+        self.bits = bits
+        self.size = size
+        self.e = e
+        self.path = path
+        self._primes = deque()
+        self._pending = set()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._error = None
+        if path and os.path.exists(path):
+            self.load(path)
+        self._executor = ProcessPoolExecutor(max_workers=processes)
+        self._refill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        with self._condition:
+            return len(self._primes)
+
+    def _refill(self):
+        """Start enough prime searches to bring the pool back to its size"""
+        with self._condition:
+            if self._closed:
+                return
+            missing = self.size - len(self._primes) - len(self._pending)
+            for _ in range(missing):
+                future = self._executor.submit(rsa_tools.generate_prime, self.bits, self.e)
+                self._pending.add(future)
+                future.add_done_callback(self._on_prime)
+
+    def _on_prime(self, future):
+        with self._condition:
+            self._pending.discard(future)
+            if future.cancelled():
+                return
+            error = future.exception()
+            if error is not None:
+                # Searches fail for good (bad bits, broken workers), so rather than
+                # resubmit forever every take() on an empty pool raises from now on
+                self._error = error
+                self._condition.notify_all()
+                return
+            self._primes.append(future.result())
+            self._condition.notify()
+        self._refill()
+
+    def take(self, timeout=None):
+        """
+        Take a prime from the pool, waiting for a worker if it is empty.
+        Raises TimeoutError if none arrives within timeout seconds, and
+        RuntimeError if the pool is closed or, once the primes on hand are
+        used up, if a prime search has failed.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._primes or self._closed or self._error, timeout):
+                raise TimeoutError("No prime available from the pool")
+            if not self._primes:
+                if self._error is not None:
+                    raise RuntimeError("Prime search failed") from self._error
+                raise RuntimeError("Prime pool is closed")
+            prime = self._primes.popleft()
+        self._refill()
+        return prime
+
+    def generate_keys(self, timeout=None):
+        """Build an RSA key pair with a 2 * bits modulus from two pooled primes"""
+        p = self.take(timeout)
+        q = self.take(timeout)
+        while q == p:
+            q = self.take(timeout)
+        return rsa_tools.build_keys(p, q, self.e)
+
+    def save(self, path=None):
+        """Write the primes currently in the pool to a JSON file"""
+        path = path or self.path
+        with self._condition:
+            data = {
+                'bits': self.bits,
+                'e': self.e,
+                'primes': [format(prime, 'x') for prime in self._primes],
+            }
+        # The primes are private key material, so the file is readable by the owner only
+        temp_path = f"{path}.tmp"
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'w') as file:
+            json.dump(data, file)
+        os.replace(temp_path, path)
+
+    def load(self, path=None):
+        """
+        Add the primes from a file written by save, then delete the file, so
+        they belong to this pool alone and are only written back by a later
+        save. A file for another size or exponent is left alone. Every prime
+        is adopted, even past size; the pool just starts fewer searches.
+        """
+        path = path or self.path
+        with open(path) as file:
+            data = json.load(file)
+        if data.get('bits') != self.bits or data.get('e') != self.e:
+            return
+        primes = [int(value, 16) for value in data['primes']]
+        with self._condition:
+            self._primes.extend(primes)
+            self._condition.notify_all()
+        os.remove(path)
+
+    def _holds_other_pool(self, path):
+        """Whether path is a pool file for another size or exponent"""
+        try:
+            with open(path) as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return False
+        return isinstance(data, dict) and (data.get('bits') != self.bits or data.get('e') != self.e)
+
+    def close(self, save=True):
+        """Stop the workers, saving the pool first if it has a path"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+            pending = list(self._pending)
+        for future in pending:
+            future.cancel()
+        if save and self.path:
+            if self._holds_other_pool(self.path):
+                logging.warning(f"Not saving primes over {self.path}, which holds primes of another size")
+            else:
+                self.save()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,86 @@
+import json
+import os
+import stat
+import sys
+import tempfile
+import threading
+
+import rsa_tools
+from prime_pool import PrimePool
+
+# Prime size for the checks; small so the workers find primes quickly
+BITS = 128
+
+# Seconds any single take() may need before it counts as hanging
+TAKE_TIMEOUT = 30
+
+
+def _take_outcome(pool, timeout):
+    """Name of the exception take(timeout) raised, or 'prime' if it returned one"""
+    try:
+        pool.take(timeout)
+    except Exception as e:
+        return type(e).__name__
+    return 'prime'
+
+
+def check_failed_search():
+    """A failing search must make take() raise every time, and never hang"""
+    problems = []
+    # generate_prime rejects 8-bit primes, so every search fails
+    with PrimePool(bits=8, size=2, processes=1) as pool:
+        outcomes = [_take_outcome(pool, TAKE_TIMEOUT) for _ in range(2)]
+        result = []
+        waiter = threading.Thread(target=lambda: result.append(_take_outcome(pool, None)), daemon=True)
+        waiter.start()
+        waiter.join(TAKE_TIMEOUT)
+        outcomes.append(result[0] if result else 'hang')
+    print(f"take -> error -> take: {', '.join(outcomes)}")
+    if outcomes != ['RuntimeError'] * 3:
+        problems.append(f"failed search gave {outcomes}, expected RuntimeError every time")
+    return problems
+
+
+def check_pool_file(directory):
+    """A matching pool file is consumed, another size's file is kept, saves are owner-only"""
+    problems = []
+    path = os.path.join(directory, 'primes.json')
+    primes = [rsa_tools.generate_prime(BITS) for _ in range(3)]
+    with open(path, 'w') as file:
+        json.dump({'bits': BITS, 'e': rsa_tools.DEFAULT_EXPONENT,
+                   'primes': [format(prime, 'x') for prime in primes]}, file)
+    pool = PrimePool(bits=BITS, size=2, processes=1, path=path)
+    if os.path.exists(path):
+        problems.append("pool file was not consumed on load")
+    taken = [pool.take(TAKE_TIMEOUT) for _ in range(3)]
+    if taken != primes:
+        problems.append("primes from the pool file were not all handed out first")
+    pool.close()
+    mode = stat.S_IMODE(os.stat(path).st_mode)
+    print(f"matching file: consumed on load, saved again with mode {oct(mode)}")
+    if mode != 0o600:
+        problems.append(f"pool file saved with mode {oct(mode)}, expected 0o600")
+
+    with open(path) as file:
+        saved = file.read()
+    pool = PrimePool(bits=BITS * 2, size=1, processes=1, path=path)
+    pool.close()
+    with open(path) as file:
+        kept = file.read() == saved
+    print(f"file for another size: {'kept' if kept else 'lost'}")
+    if not kept:
+        problems.append("pool file for another prime size was deleted or overwritten")
+    return problems
+
+
+def check():
+    """Run every check and return a list of failures (empty when all pass)"""
+    with tempfile.TemporaryDirectory() as directory:
+        return check_failed_search() + check_pool_file(directory)
+
+
+if __name__ == "__main__":
+    problems = check()
+    for problem in problems:
+        print(f"Failed: {problem}")
+    sys.exit(1 if problems else 0)
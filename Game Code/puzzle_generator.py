@@ -0,0 +1,174 @@
+import random
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+from crypto_tools import CryptoTools
+
+PUZZLE_TYPES = ('caesar', 'vigenere', 'morse', 'binary')
+
+# Words puzzles are built from, and that Vigenère keys are drawn from
+WORD_CORPUS = (
+    'KEY', 'CODE', 'MASK', 'LOCK', 'SAFE', 'HASH', 'SALT', 'SEED', 'BYTE', 'BITS',
+    'PRIME', 'ROTOR', 'TOKEN', 'NONCE', 'BLOCK', 'CRYPT', 'PROOF', 'VAULT', 'CHEST',
+    'SHIFT', 'QUEST', 'RIDDLE', 'CIPHER', 'SECRET', 'ENIGMA', 'SIGNAL', 'PUBLIC',
+    'PRIVATE', 'MESSAGE', 'DECODER', 'PADLOCK', 'KEYRING', 'TREASURE', 'MODULUS',
+    'EXPONENT', 'SIGNATURE', 'ALGORITHM', 'PLAINTEXT', 'KEYSTREAM', 'CIPHERTEXT',
+)
+
+# Per tier: words in the plaintext, their length range, the Caesar shift
+# range and the Vigenère key length range
+DIFFICULTY_TIERS = {
+    'easy': {'words': 1, 'word_length': (3, 5), 'shift': (1, 5), 'key_length': (3, 4)},
+    'medium': {'words': 2, 'word_length': (4, 7), 'shift': (1, 25), 'key_length': (4, 6)},
+    'hard': {'words': 4, 'word_length': (5, 10), 'shift': (1, 25), 'key_length': (6, 10)},
+}
+
+_WORDS_BY_LENGTH = {}
+for _word in WORD_CORPUS:
+    _WORDS_BY_LENGTH.setdefault(len(_word), []).append(_word)
+
+
+@lru_cache(maxsize=None)
+def _words_in_range(low, high):
+    return tuple(word for length in range(low, high + 1) for word in _WORDS_BY_LENGTH.get(length, ()))
+
+
+def _pick_word(rng, length_range):
+    return rng.choice(_words_in_range(*length_range))
+
+
+def generate_puzzle(puzzle_type=None, difficulty='easy', rng=None):
+    """
+    Build one puzzle in the GameData.PUZZLES format.
+
+    The plaintext is drawn from WORD_CORPUS according to the difficulty
+    tier and encrypted with CryptoTools. puzzle_type defaults to a random
+    type; rng is a random.Random, for reproducible puzzles.
+    """
+    rng = rng or random
+    if puzzle_type is None:
+        puzzle_type = rng.choice(PUZZLE_TYPES)
+    if puzzle_type not in PUZZLE_TYPES:
+        raise ValueError(f"Unknown puzzle type: {puzzle_type}")
+    tier = DIFFICULTY_TIERS[difficulty]
+    solution = ' '.join(_pick_word(rng, tier['word_length']) for _ in range(tier['words']))
+
+    if puzzle_type == 'caesar':
+        shift = rng.randint(*tier['shift'])
+        encrypted = CryptoTools.caesar_cipher(solution, shift)
+        hint = f"Shift each letter back by {shift} positions" if difficulty == 'easy' else \
+            "Try every shift from 1 to 25"
+    elif puzzle_type == 'vigenere':
+        key = _pick_word(rng, tier['key_length'])
+        encrypted = CryptoTools.vigenere_cipher(solution, key)
+        if difficulty == 'easy':
+            hint = f"The key is {key}"
+        elif difficulty == 'medium':
+            hint = f"The key is a {len(key)}-letter word starting with {key[0]}"
+        else:
+            hint = f"The key is a {len(key)}-letter word"
+    elif puzzle_type == 'morse':
+        encrypted = CryptoTools.morse_code(solution)
+        hint = "Each letter is a pattern of dots and dashes"
+    else:
+        encrypted = CryptoTools.text_to_binary(solution)
+        hint = "Each group of 8 bits is one character"
+
+    return {
+        'type': puzzle_type,
+        'encrypted_text': encrypted,
+        'hint': hint,
+        'solution': solution,
+        'reward': None,
+        'difficulty': difficulty,
+    }
+
+
+def generate_puzzles(count, prefix='generated', puzzle_type=None, difficulty='easy', seed=None):
+    """Build count named puzzles, e.g. for a content pack's puzzles section"""
+    rng = random.Random(seed)
+    width = len(str(count))
+    return {f"{prefix}_{i:0{width}d}": generate_puzzle(puzzle_type, difficulty, rng)
+            for i in range(count)}
+
+
+class PuzzlePool:
+    """
+    Bounded pool of ready-made puzzles for every type and difficulty.
+
+    Background worker threads keep up to `size` puzzles per (type,
+    difficulty) pair. take() is a deque pop, and it only wakes the workers
+    once a queue falls below half full. If a queue has run dry it builds
+    the puzzle on the spot instead of waiting, so take() never blocks.
+    """
+
+    def __init__(self, size=64, workers=1, types=PUZZLE_TYPES,
+                 difficulties=tuple(DIFFICULTY_TIERS), seed=None):
+        self.size = size
+        self.types = tuple(types)
+        self.difficulties = tuple(difficulties)
+        self._queues = {(puzzle_type, difficulty): deque()
+                        for puzzle_type in self.types for difficulty in self.difficulties}
+        self._low_water = max(1, size // 2)
+        self._rng = random.Random(seed)
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._workers = [threading.Thread(target=self._fill, args=(random.Random(self._rng.random()),),
+                                          name=f"PuzzlePool-{i}", daemon=True)
+                         for i in range(workers)]
+        self._wakeup.set()
+        for worker in self._workers:
+            worker.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _fill(self, rng):
+        """Worker loop: top every queue back up to size, then sleep until woken"""
+        while not self._closed:
+            self._wakeup.wait()
+            if self._closed:
+                return
+            self._wakeup.clear()
+            for (puzzle_type, difficulty), queue in self._queues.items():
+                while len(queue) < self.size and not self._closed:
+                    queue.append(generate_puzzle(puzzle_type, difficulty, rng))
+
+    def take(self, puzzle_type=None, difficulty=None):
+        """Hand out a fresh puzzle, random type or difficulty when not given"""
+        if puzzle_type is None:
+            puzzle_type = self._rng.choice(self.types)
+        if difficulty is None:
+            difficulty = self._rng.choice(self.difficulties)
+        queue = self._queues[(puzzle_type, difficulty)]
+        try:
+            puzzle = queue.popleft()
+        except IndexError:
+            puzzle = generate_puzzle(puzzle_type, difficulty, random.Random(self._rng.random()))
+        if len(queue) < self._low_water:
+            self._wakeup.set()
+        return puzzle
+
+    def wait_until_full(self, timeout=None):
+        """Block until every queue is full, for warming the pool before use"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while len(self) < self.size * len(self._queues):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self):
+        """Stop the workers"""
+        self._closed = True
+        self._wakeup.set()
+        for worker in self._workers:
+            worker.join()
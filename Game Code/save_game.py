@@ -0,0 +1,186 @@
+import json
+import logging
+import os
+
+# Save files live here, one snapshot and one journal per save name
+SAVE_DIR = os.environ.get(
+    'CRYPTOQUEST_SAVE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cryptoquest', 'saves'))
+
+# Journal entries written before the state is compacted into a new snapshot
+SNAPSHOT_EVERY = 256
+
+
+def new_state(start_room='entrance'):
+    """The state of a game that has not been played yet"""
+    return {
+        'current_room': start_room,
+        'inventory': [],
+        'solved_puzzles': [],
+        'score': 0,
+        'achievements': [],
+        # Items taken out of each room, one entry per copy, so room contents can be restored
+        'taken': {},
+    }
+
+
+def apply_action(state, entry):
+    """
+    Apply one journal entry to a state dict in place.
+
+    A journal is only replayed over the snapshot of its own generation, so
+    each entry is applied once. Every take counts, since a room may hold
+    several copies of an item; solving a puzzle or earning an achievement
+    again has no further effect. An entry with missing fields raises
+    KeyError before it changes the state.
+    """
+    action = entry['action']
+    if action == 'move':
+        state['current_room'] = entry['room']
+    elif action == 'take':
+        room, item = entry['room'], entry['item']
+        state['taken'].setdefault(room, []).append(item)
+        state['inventory'].append(item)
+    elif action == 'solve':
+        if entry['puzzle'] not in state['solved_puzzles']:
+            state['solved_puzzles'].append(entry['puzzle'])
+            if entry.get('reward'):
+                state['inventory'].append(entry['reward'])
+    elif action == 'achievement':
+        if entry['name'] not in state['achievements']:
+            state['achievements'].append(entry['name'])
+            state['score'] += entry.get('points', 0)
+    else:
+        raise ValueError(f"Unknown journal action: {action}")
+
+
+class SaveGame:
+    """
+    Append-only journaled save game.
+
+    Every action is one JSON line appended to the journal and flushed to
+    the operating system (without an fsync), so a move or take costs a
+    small write instead of serializing the whole state, and a crash or
+    kill of the game loses nothing the OS has been handed. Every
+    SNAPSHOT_EVERY entries, and on close, the state is written to a
+    compact snapshot and the journal restarts. Loading reads the snapshot
+    and replays only the journal written after it.
+
+    The snapshot and journal carry a generation number: a journal is only
+    replayed over the snapshot of the same generation, so a crash between
+    writing a snapshot and restarting the journal cannot apply entries
+    twice or lose them.
+    """
+
+    def __init__(self, name='default', directory=None, snapshot_every=SNAPSHOT_EVERY):
+        self.directory = directory or SAVE_DIR
+        self.snapshot_path = os.path.join(self.directory, f"{name}.snapshot.json")
+        self.journal_path = os.path.join(self.directory, f"{name}.journal")
+        self.snapshot_every = snapshot_every
+        self.state = new_state()
+        self.generation = 0
+        self._entries = 0
+        self._journal = None
+        # Whether the journal on disk matches self.state and can be appended to
+        self._journal_clean = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def load(self):
+        """Rebuild the state from the last snapshot and the journal after it"""
+        self.state = new_state()
+        self.generation = 0
+        try:
+            with open(self.snapshot_path) as file:
+                snapshot = json.load(file)
+            self.state.update(snapshot['state'])
+            self.generation = snapshot['generation']
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            logging.warning(f"Ignoring unreadable snapshot {self.snapshot_path}: {str(e)}")
+
+        self._entries = 0
+        self._journal_clean = False
+        try:
+            with open(self.journal_path) as file:
+                lines = iter(file)
+                header = json.loads(next(lines, '{}') or '{}')
+                if header.get('generation') == self.generation:
+                    self._journal_clean = True
+                    for line in lines:
+                        try:
+                            if not line.endswith('\n'):
+                                raise ValueError("incomplete entry")
+                            apply_action(self.state, json.loads(line))
+                        except (ValueError, KeyError, TypeError, AttributeError):
+                            # A torn final line from an interrupted write, or an entry
+                            # missing its fields: keep the state replayed so far
+                            self._journal_clean = False
+                            break
+                        self._entries += 1
+        except FileNotFoundError:
+            self._journal_clean = True
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable journal {self.journal_path}: {str(e)}")
+        return self.state
+
+    def record(self, action, **fields):
+        """Apply an action to the state and append it to the journal"""
+        if self._journal is None:
+            if self._journal_clean:
+                self._open_journal()
+            else:
+                # The journal on disk is stale or damaged, start over from a snapshot
+                self.snapshot()
+        entry = dict(action=action, **fields)
+        apply_action(self.state, entry)
+        self._journal.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        self._journal.flush()
+        self._entries += 1
+        if self._entries >= self.snapshot_every:
+            self.snapshot()
+
+    def flush(self):
+        """Push buffered journal entries to the operating system"""
+        if self._journal is not None:
+            self._journal.flush()
+
+    def snapshot(self):
+        """Write the state to a new snapshot and start an empty journal"""
+        os.makedirs(self.directory, exist_ok=True)
+        generation = self.generation + 1
+        temp_path = f"{self.snapshot_path}.tmp"
+        with open(temp_path, 'w') as file:
+            json.dump({'generation': generation, 'state': self.state}, file, separators=(',', ':'))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.snapshot_path)
+
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        self.generation = generation
+        self._entries = 0
+        self._open_journal(truncate=True)
+        self._journal_clean = True
+
+    def _open_journal(self, truncate=False):
+        os.makedirs(self.directory, exist_ok=True)
+        if not truncate and os.path.exists(self.journal_path):
+            self._journal = open(self.journal_path, 'a')
+            return
+        self._journal = open(self.journal_path, 'w')
+        self._journal.write(json.dumps({'generation': self.generation}) + '\n')
+
+    def close(self, snapshot=True):
+        """Flush the journal, compacting it into a snapshot first if asked"""
+        if snapshot and self._entries:
+            self.snapshot()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
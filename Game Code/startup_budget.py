@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+
+# Startup budgets in seconds; measure() reports any that are exceeded
+IMPORT_BUDGET = 0.25
+FIRST_FRAME_BUDGET = 1.5
+
+# Modules that must not be imported just by starting the game
+DEFERRED_MODULES = ('pygame', 'requests', 'pyfiglet', 'colorama', 'numpy')
+
+_GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Run in a fresh interpreter so nothing is already imported or cached
+_IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+import gui_game
+elapsed = time.perf_counter() - start
+loaded = [name for name in {deferred!r} if name in sys.modules]
+print(elapsed)
+print(','.join(loaded))
+"""
+
+_FIRST_FRAME_PROBE = """
+import time
+start = time.perf_counter()
+import tkinter as tk
+import gui_game
+root = tk.Tk()
+app = gui_game.CryptoQuestGUI(root)
+def first_frame():
+    print(time.perf_counter() - start)
+    root.destroy()
+root.after_idle(first_frame)
+root.mainloop()
+"""
+
+
+def _run_probe(code):
+    result = subprocess.run([sys.executable, '-c', code], cwd=_GAME_DIR,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else "probe failed")
+    return result.stdout.splitlines()
+
+
+def measure_import():
+    """Seconds to import gui_game in a fresh interpreter, and the deferred modules it pulled in"""
+    lines = _run_probe(_IMPORT_PROBE.format(deferred=DEFERRED_MODULES))
+    loaded = [name for name in lines[1].split(',') if name] if len(lines) > 1 else []
+    return float(lines[0]), loaded
+
+
+def measure_first_frame():
+    """Seconds from process start to the first mainloop iteration, or None without a display"""
+    try:
+        return float(_run_probe(_FIRST_FRAME_PROBE)[0])
+    except RuntimeError as e:
+        if 'display' in str(e).lower():
+            return None
+        raise
+
+
+def measure():
+    """Measure startup and return a list of budget violations (empty when within budget)"""
+    problems = []
+    import_time, loaded = measure_import()
+    print(f"import gui_game: {import_time * 1000:.0f} ms (budget {IMPORT_BUDGET * 1000:.0f} ms)")
+    if import_time > IMPORT_BUDGET:
+        problems.append(f"import took {import_time:.3f}s")
+    if loaded:
+        problems.append(f"imported at startup: {', '.join(loaded)}")
+
+    first_frame = measure_first_frame()
+    if first_frame is None:
+        print("first frame: skipped, no display available")
+    else:
+        print(f"first frame: {first_frame * 1000:.0f} ms (budget {FIRST_FRAME_BUDGET * 1000:.0f} ms)")
+        if first_frame > FIRST_FRAME_BUDGET:
+            problems.append(f"first frame took {first_frame:.3f}s")
+    return problems
+
+
+if __name__ == "__main__":
+    problems = measure()
+    for problem in problems:
+        print(f"Over budget: {problem}")
+    sys.exit(1 if problems else 0)